@@ -1 +1,6 @@
-"""CLI command modules."""
+"""CLI command modules.
+
+Heavy dependencies (boto3, docker, pydantic models, rich tables and prompts) are
+imported inside the commands, so `surek --help` and unrelated commands don't pay
+for them.
+"""
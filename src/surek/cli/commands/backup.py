@@ -1,33 +1,35 @@
 """Backup management commands."""
 
+import glob
+import os
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import docker
 import typer
-from rich.console import Console
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
-
-from surek.core.backup import (
-    decrypt_and_extract_backup,
-    download_backup,
-    list_backups,
-    trigger_backup,
-)
-from surek.core.config import load_config, load_stack_config
-from surek.core.deploy import deploy_system_stack, start_stack, stop_stack
-from surek.core.docker import ensure_surek_network
-from surek.core.stacks import get_available_stacks, get_stack_by_name
+
 from surek.exceptions import BackupError, SurekError
-from surek.utils.logging import format_bytes
-from surek.utils.paths import get_data_dir, get_system_dir
+from surek.utils.logging import format_bytes, get_console, print_json
+
+if TYPE_CHECKING:
+    from surek.models.config import SurekConfig
+    from surek.models.stack import StackConfig
 
-console = Console()
 app = typer.Typer(help="Backup management commands")
 
 
+# Colors for backup types in listings
+BACKUP_TYPE_STYLES = {
+    "daily": "blue",
+    "weekly": "green",
+    "monthly": "magenta",
+    "manual": "yellow",
+}
+
+
 @app.callback(invoke_without_command=True)
 def backup_default(ctx: typer.Context) -> None:
     """List all backups in S3 (default command)."""
@@ -40,6 +42,11 @@ def list_backups_cmd(
     json_output: bool = typer.Option(False, "--json", help="Output as JSON"),
 ) -> None:
     """List all backups in S3."""
+    from surek.core.backup import list_backups
+    from surek.core.config import load_config
+
+    console = get_console()
+
     try:
         config = load_config()
 
@@ -50,8 +57,6 @@ def list_backups_cmd(
         backups = list_backups(config.backup)
 
         if json_output:
-            import json
-
             data = [
                 {
                     "name": b.name,
@@ -61,11 +66,15 @@ def list_backups_cmd(
                 }
                 for b in backups
             ]
-            console.print(json.dumps(data, indent=2))
+            print_json(data)
         else:
             if not backups:
                 console.print("No backups found")
                 return
+
+            from rich.table import Table
+            from rich.text import Text
+
             table = Table(title="Backups")
             table.add_column("Backup", style="cyan")
             table.add_column("Type")
@@ -73,22 +82,9 @@ def list_backups_cmd(
             table.add_column("Created")
 
             for backup in backups:
-                # Color by type
-                backup_type = backup.backup_type
-                if backup_type == "daily":
-                    type_text = f"[blue]{backup_type}[/blue]"
-                elif backup_type == "weekly":
-                    type_text = f"[green]{backup_type}[/green]"
-                elif backup_type == "monthly":
-                    type_text = f"[magenta]{backup_type}[/magenta]"
-                elif backup_type == "manual":
-                    type_text = f"[yellow]{backup_type}[/yellow]"
-                else:
-                    type_text = backup_type
-
                 table.add_row(
                     backup.name,
-                    type_text,
+                    Text(backup.backup_type, style=BACKUP_TYPE_STYLES.get(backup.backup_type, "")),
                     format_bytes(backup.size),
                     backup.created.strftime("%Y-%m-%d %H:%M"),
                 )
@@ -103,6 +99,11 @@ def list_backups_cmd(
 @app.command(name="run")
 def run_backup() -> None:
     """Trigger an immediate backup."""
+    from surek.core.backup import trigger_backup
+    from surek.core.config import load_config
+
+    console = get_console()
+
     try:
         config = load_config()
 
@@ -117,6 +118,33 @@ def run_backup() -> None:
         raise typer.Exit(1) from None
 
 
+def _restart_stack(
+    stack_name: str, surek_config: "SurekConfig", stack_config: "StackConfig | None" = None
+) -> None:
+    """Start a stack stopped for restore, reporting failures instead of raising.
+
+    This runs while cleaning up after restore, so any error is reported
+    rather than raised, where it would hide the restore's own error and
+    leave the remaining stacks stopped.
+    """
+    console = get_console()
+
+    try:
+        from surek.core.deploy import deploy_system_stack, start_stack
+        from surek.core.docker import ensure_surek_network
+
+        if stack_config is None:
+            ensure_surek_network()
+            deploy_system_stack(surek_config)
+        else:
+            start_stack(stack_config)
+        console.print(f"  Started {stack_name}")
+    except Exception as e:
+        console.print(
+            f"  Failed to start {stack_name}: {e}", style="yellow", markup=False, highlight=False
+        )
+
+
 @app.command(name="restore")
 def restore_backup(
     backup_id: str | None = typer.Option(None, "--id", help="Backup filename to restore"),
@@ -124,6 +152,29 @@ def restore_backup(
     volume: str | None = typer.Option(None, "--volume", help="Specific volume to restore"),
 ) -> None:
     """Restore volumes from a backup."""
+    from rich.progress import (
+        BarColumn,
+        MofNCompleteColumn,
+        Progress,
+        SpinnerColumn,
+        TextColumn,
+        TimeElapsedColumn,
+    )
+    from rich.prompt import Confirm, Prompt
+
+    from surek.core.backup import (
+        decrypt_and_extract_stream,
+        list_backups,
+        stream_download_backup,
+    )
+    from surek.core.config import load_config, load_stack_config
+    from surek.core.deploy import stop_stack
+    from surek.core.docker import get_running_projects
+    from surek.core.stacks import get_available_stacks, get_stack_by_name
+    from surek.utils.paths import get_data_dir, get_system_dir
+
+    console = get_console()
+
     try:
         config = load_config()
 
@@ -133,16 +184,17 @@ def restore_backup(
 
         # Interactive mode if no backup_id
         if backup_id is None:
-            backups = list_backups(config.backup)
+            backups = list_backups(config.backup, limit=20)
             if not backups:
                 console.print("No backups found")
                 raise typer.Exit(1) from None
 
-            console.print("\n[bold]Available backups:[/bold]")
-            for i, b in enumerate(backups[:20], 1):
-                console.print(
-                    f"  {i}. {b.name} ({format_bytes(b.size)}, {b.created.strftime('%Y-%m-%d %H:%M')})"
-                )
+            # Render the whole list in one write instead of a print per line
+            lines = [
+                f"  {i}. {b.name} ({format_bytes(b.size)}, {b.created.strftime('%Y-%m-%d %H:%M')})"
+                for i, b in enumerate(backups, 1)
+            ]
+            console.print("\n[bold]Available backups:[/bold]\n" + "\n".join(lines), highlight=False)
 
             choice = Prompt.ask(
                 "\nEnter backup number to restore",
@@ -163,93 +215,116 @@ def restore_backup(
             console.print("[yellow]Aborted[/yellow]")
             raise typer.Exit(0)
 
-        stopped_stacks: list[str] = []
-
-        def is_stack_running(name: str) -> bool:
-            """Check if a stack has any running containers."""
-            try:
-                client = docker.from_env()
-                containers = client.containers.list(
-                    filters={"label": f"com.docker.compose.project={name}"}
-                )
-                return len(containers) > 0
-            except Exception:
-                return False
+        try:
+            running_projects = get_running_projects()
+        except SurekError:
+            running_projects = set()
 
+        to_stop: dict[str, StackConfig] = {}
         if stack:
             console.print(f"Stopping stack {stack}...")
             stack_info = get_stack_by_name(stack)
-            if stack_info.config and is_stack_running(stack):
-                stop_stack(stack_info.config, silent=True)
-                stopped_stacks.append(stack)
+            if stack_info.config and stack in running_projects:
+                to_stop[stack] = stack_info.config
         else:
             console.print("Stopping all stacks...")
 
             try:
                 system_dir = get_system_dir()
                 system_config = load_stack_config(system_dir / "surek.stack.yml")
-                if is_stack_running(system_config.name):
-                    stop_stack(system_config, silent=True)
-                    stopped_stacks.append("system")
+                if system_config.name in running_projects:
+                    to_stop["system"] = system_config
             except SurekError:
                 pass
 
             try:
                 for s in get_available_stacks():
-                    if s.valid and s.config and is_stack_running(s.config.name):
-                        stop_stack(s.config, silent=True)
-                        stopped_stacks.append(s.config.name)
+                    if s.valid and s.config and s.config.name in running_projects:
+                        to_stop[s.config.name] = s.config
             except SurekError:
                 pass
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            backup_path = temp_path / backup_id
-
-            console.print(f"Downloading backup {backup_id}...", highlight=False)
-            download_backup(config.backup, backup_id, backup_path)
-
-            console.print("Decrypting and extracting...")
-            extract_dir = temp_path / "extracted"
-            decrypt_and_extract_backup(backup_path, config.backup.password, extract_dir)
-
-            # Restore volumes
-            volumes_dir = get_data_dir() / "volumes"
-            backup_volumes = extract_dir / "backup"  # docker-volume-backup structure
-
-            if backup_volumes.exists():
-                for stack_dir in backup_volumes.iterdir():
-                    if stack and stack_dir.name != stack:
-                        continue
-
-                    target_stack_dir = volumes_dir / stack_dir.name
-                    target_stack_dir.mkdir(parents=True, exist_ok=True)
-
-                    for volume_dir in stack_dir.iterdir():
-                        if volume and volume_dir.name != volume:
-                            continue
-
-                        target_volume_dir = target_stack_dir / volume_dir.name
-                        console.print(f"  Restoring {stack_dir.name}/{volume_dir.name}...")
+        try:
+            # Stacks are independent, so stop them concurrently
+            if to_stop:
+                with ThreadPoolExecutor(max_workers=min(len(to_stop), 8)) as executor:
+                    list(executor.map(lambda c: stop_stack(c, silent=True), to_stop.values()))
+
+            # Let tar skip everything we're not going to restore
+            # (docker-volume-backup structure: backup/<stack>/<volume>)
+            members: list[str] | None = None
+            if stack and volume:
+                members = [f"backup/{glob.escape(stack)}/{glob.escape(volume)}"]
+            elif stack:
+                members = [f"backup/{glob.escape(stack)}"]
+            elif volume:
+                members = [f"backup/*/{glob.escape(volume)}"]
+
+            # Extract next to the volumes, so moving them into place is a cheap
+            # rename rather than a copy across filesystems
+            restore_tmp_dir = get_data_dir() / ".restore-tmp"
+            restore_tmp_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.TemporaryDirectory(
+                dir=restore_tmp_dir, prefix=f"restore-{backup_id}-"
+            ) as temp_dir:
+                extract_dir = Path(temp_dir)
+
+                console.print(f"Downloading and extracting backup {backup_id}...", highlight=False)
+                download = partial(stream_download_backup, config.backup, backup_id)
+                decrypt_and_extract_stream(download, config.backup.password, extract_dir, members)
+
+                # Restore volumes
+                volumes_dir = get_data_dir() / "volumes"
+                backup_volumes = extract_dir / "backup"
+
+                # Collect volume folders up front, so progress knows the total.
+                # scandir entries carry the file type, saving a stat per entry.
+                to_restore: list[tuple[str, os.DirEntry[str]]] = []
+                if backup_volumes.exists():
+                    with os.scandir(backup_volumes) as stack_entries:
+                        for stack_entry in stack_entries:
+                            if not stack_entry.is_dir(follow_symlinks=False):
+                                continue
+                            with os.scandir(stack_entry.path) as volume_entries:
+                                to_restore.extend((stack_entry.name, v) for v in volume_entries)
+                if not to_restore:
+                    console.print("[yellow]Nothing to restore in this backup[/yellow]")
+
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("{task.description}"),
+                    BarColumn(),
+                    MofNCompleteColumn(),
+                    TimeElapsedColumn(),
+                    console=console,
+                ) as progress:
+                    task = progress.add_task("Restoring volumes", total=len(to_restore))
+                    for stack_dir_name, volume_entry in to_restore:
+                        progress.update(
+                            task, description=f"Restoring {stack_dir_name}/{volume_entry.name}"
+                        )
+                        target_volume_dir = volumes_dir / stack_dir_name / volume_entry.name
+                        target_volume_dir.parent.mkdir(parents=True, exist_ok=True)
 
                         if target_volume_dir.exists():
                             shutil.rmtree(target_volume_dir)
-                        shutil.move(volume_dir, target_volume_dir)
-
-        # Restart stopped stacks
-        console.print("\nRestarting stacks...")
-        for stack_name in stopped_stacks:
-            try:
-                if stack_name == "system":
-                    ensure_surek_network()
-                    deploy_system_stack(config)
-                else:
-                    stack_info = get_stack_by_name(stack_name)
-                    if stack_info.config:
-                        start_stack(stack_info.config)
-                console.print(f"  Started {stack_name}")
-            except SurekError as e:
-                console.print(f"  [yellow]Failed to start {stack_name}: {e}[/yellow]")
+                        shutil.move(volume_entry.path, target_volume_dir)
+                        progress.advance(task)
+                    progress.update(task, description="Restored volumes")
+        finally:
+            # Restart stopped stacks even if the restore failed, so they don't stay down
+            # (system first, as it provides the network and proxy)
+            console.print("\nRestarting stacks...")
+            if "system" in to_stop:
+                _restart_stack("system", config)
+            user_stacks = [name for name in to_stop if name != "system"]
+            if user_stacks:
+                with ThreadPoolExecutor(max_workers=min(len(user_stacks), 8)) as executor:
+                    list(
+                        executor.map(
+                            lambda name: _restart_stack(name, config, to_stop[name]), user_stacks
+                        )
+                    )
 
         console.print("\n[green]Restore completed.[/green]")
 
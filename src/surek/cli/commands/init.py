@@ -1,69 +1,97 @@
 """Init and new commands for creating Surek configurations."""
 
+import contextlib
 import json
+from functools import cache
 from pathlib import Path
+from typing import TextIO
 
 import typer
-import yaml
-from rich.console import Console
-from rich.prompt import Confirm, Prompt
 
-console = Console()
+from surek.utils.logging import get_console
 
 # Schema file names
 SUREK_CONFIG_SCHEMA = "surek.config.schema.json"
 STACK_CONFIG_SCHEMA = "surek.stack.schema.json"
 
 
+@cache
+def _schema_json() -> tuple[bytes, bytes]:
+    """Render the surek and stack config schemas as UTF-8 JSON, once per process.
+
+    Returns:
+        Tuple of (surek_config_schema_json, stack_config_schema_json).
+    """
+    from surek.models.config import SurekConfig
+    from surek.models.stack import StackConfig
+
+    return (
+        json.dumps(SurekConfig.model_json_schema(), indent=2).encode(),
+        json.dumps(StackConfig.model_json_schema(), indent=2).encode(),
+    )
+
+
 def generate_schemas(output_dir: Path = Path(".")) -> tuple[Path, Path]:
     """Generate JSON schemas for surek configuration files.
 
+    Files that already contain the current schema are left untouched.
+
     Args:
         output_dir: Directory to write schema files.
 
     Returns:
         Tuple of (surek_config_schema_path, stack_config_schema_path).
     """
-    from surek.models.config import SurekConfig
-    from surek.models.stack import StackConfig
-
     output_dir.mkdir(parents=True, exist_ok=True)
+    surek_schema, stack_schema = _schema_json()
 
-    # Generate surek config schema
-    surek_schema = SurekConfig.model_json_schema()
     surek_schema_path = output_dir / SUREK_CONFIG_SCHEMA
-    surek_schema_path.write_text(json.dumps(surek_schema, indent=2))
+    _write_if_changed(surek_schema_path, surek_schema)
 
-    # Generate stack config schema
-    stack_schema = StackConfig.model_json_schema()
     stack_schema_path = output_dir / STACK_CONFIG_SCHEMA
-    stack_schema_path.write_text(json.dumps(stack_schema, indent=2))
+    _write_if_changed(stack_schema_path, stack_schema)
 
     return surek_schema_path, stack_schema_path
 
 
+def _write_if_changed(path: Path, content: bytes) -> None:
+    """Write content to path unless the file already holds exactly that."""
+    try:
+        if path.read_bytes() == content:
+            return
+    except OSError:
+        pass
+    path.write_bytes(content)
+
+
 def schema_command() -> None:
     """Generate JSON schemas for configuration files."""
+    console = get_console()
     surek_path, stack_path = generate_schemas()
-    console.print("[green]Generated schemas:[/green]")
-    console.print(f"  • {surek_path}")
-    console.print(f"  • {stack_path}")
-    console.print("\nAdd this to your YAML files for autocompletion.")
-    console.print("To [bold]surek.yml[/bold]:")
-    console.print(f"  # yaml-language-server: $schema=./{SUREK_CONFIG_SCHEMA}")
-    console.print("To [bold]stack.surek.yml[/bold]:")
-    console.print(f"  # yaml-language-server: $schema=../../{STACK_CONFIG_SCHEMA}")
+    console.print(
+        "[green]Generated schemas:[/green]\n"
+        f"  • {surek_path}\n"
+        f"  • {stack_path}\n"
+        "\nAdd this to your YAML files for autocompletion.\n"
+        "To [bold]surek.yml[/bold]:\n"
+        f"  # yaml-language-server: $schema=./{SUREK_CONFIG_SCHEMA}\n"
+        "To [bold]stack.surek.yml[/bold]:\n"
+        f"  # yaml-language-server: $schema=../../{STACK_CONFIG_SCHEMA}"
+    )
 
 
 def init_command(
     git_only: bool = typer.Option(False, "--git-only", help="Only add surek-data to .gitignore"),
 ) -> None:
     """Initialize Surek configuration in the current directory."""
+    console = get_console()
     if git_only:
         _add_to_gitignore("surek-data")
-        console.print("[green]Added 'surek-data' to .gitignore[/green]")
+        console.print("Added 'surek-data' to .gitignore", style="green", markup=False)
         return
 
+    from rich.prompt import Confirm, Prompt
+
     # Interactive prompts
     console.print(
         "\n[bold]Root domain[/bold]"
@@ -78,12 +106,7 @@ def init_command(
         "Reference them in stack configs with [cyan]<default_auth>[/cyan] instead of hardcoding passwords."
     )
     default_user = Prompt.ask("Default username", default="admin")
-    default_password = None
-    while not default_password:
-        default_password = Prompt.ask("Default password", password=True)
-
-        if not default_password:
-            console.print("[red]Password cannot be empty[/red]")
+    default_password = _ask_required("Default password", password=True)
 
     console.print(
         "\n[bold]S3 backup[/bold]"
@@ -98,11 +121,11 @@ def init_command(
             "you'll need it to restore backups."
         )
         backup_config = {
-            "password": Prompt.ask("Backup encryption password", password=True),
-            "s3_endpoint": Prompt.ask("S3 endpoint"),
-            "s3_bucket": Prompt.ask("S3 bucket name"),
-            "s3_access_key": Prompt.ask("S3 access key"),
-            "s3_secret_key": Prompt.ask("S3 secret key", password=True),
+            "password": _ask_required("Backup encryption password", password=True),
+            "s3_endpoint": _ask_required("S3 endpoint"),
+            "s3_bucket": _ask_required("S3 bucket name"),
+            "s3_access_key": _ask_required("S3 access key"),
+            "s3_secret_key": _ask_required("S3 secret key", password=True),
         }
 
     console.print(
@@ -113,7 +136,7 @@ def init_command(
     configure_github = Confirm.ask("Configure GitHub access?", default=False)
     github_config: dict[str, str] | None = None
     if configure_github:
-        github_config = {"pat": Prompt.ask("GitHub Personal Access Token", password=True)}
+        github_config = {"pat": _ask_required("GitHub Personal Access Token", password=True)}
 
     # Build config
     config: dict[str, object] = {
@@ -137,35 +160,32 @@ def init_command(
     generate_schemas()
 
     # Write config with schema reference
-    with open(config_path, "w") as f:
-        f.write(f"# yaml-language-server: $schema=./{SUREK_CONFIG_SCHEMA}\n\n")
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+    config_path.write_text(
+        f"# yaml-language-server: $schema=./{SUREK_CONFIG_SCHEMA}\n\n" + _dump_yaml(config)
+    )
 
     Path("stacks").mkdir(exist_ok=True)
     _add_to_gitignore("surek-data")
 
-    console.print("[green]Created surek.yml and stacks/ directory[/green]")
-    console.print("[dim]Generated JSON schemas for editor autocompletion[/dim]")
+    console.print(
+        "[green]Created surek.yml and stacks/ directory[/green]\n"
+        "[dim]Generated JSON schemas for editor autocompletion[/dim]"
+    )
 
 
 def new_command() -> None:
     """Create a new stack interactively."""
+    from rich.prompt import Confirm, Prompt
+
+    console = get_console()
 
     root_domain = "example.com"
     config_path = Path("surek.yml")
     if config_path.exists():
-        try:
-            with open(config_path) as f:
-                surek_config = yaml.safe_load(f)
-                if surek_config and "root_domain" in surek_config:
-                    root_domain = surek_config["root_domain"]
-        except Exception:
-            pass
-
-    name = Prompt.ask("Stack name")
-    if not name:
-        console.print("[red]Stack name cannot be empty[/red]")
-        raise typer.Exit(1) from None
+        with contextlib.suppress(Exception):
+            root_domain = _read_root_domain(config_path) or root_domain
+
+    name = _ask_required("Stack name")
 
     source_type = Prompt.ask("Source type", choices=["local", "github"], default="local")
 
@@ -175,7 +195,7 @@ def new_command() -> None:
 
     compose_path = Prompt.ask("Compose file path", default="./docker-compose.yml")
 
-    public: list[dict[str, str | None]] = []
+    public: list[dict[str, str]] = []
     endpoint_num = 1
     while True:
         if endpoint_num == 1:
@@ -195,10 +215,12 @@ def new_command() -> None:
 
         target = Prompt.ask("Target (service:port)")
         add_auth = Confirm.ask("Add authentication?", default=False)
-        auth: str | None = None
+        endpoint = {"domain": domain, "target": target}
         if add_auth:
-            auth = Prompt.ask("Auth (user:pass or <default_auth>)", default="<default_auth>")
-        public.append({"domain": domain, "target": target, "auth": auth})
+            endpoint["auth"] = Prompt.ask(
+                "Auth (user:pass or <default_auth>)", default="<default_auth>"
+            )
+        public.append(endpoint)
         endpoint_num += 1
 
     stack_dir = Path("stacks") / name
@@ -210,15 +232,12 @@ def new_command() -> None:
         "compose_file_path": compose_path,
     }
     if public:
-        # Remove None auth values
-        config["public"] = [
-            {k: v for k, v in endpoint.items() if v is not None} for endpoint in public
-        ]
+        config["public"] = public
 
     config_path = stack_dir / "surek.stack.yml"
-    with open(config_path, "w") as f:
-        f.write(f"# yaml-language-server: $schema=../../{STACK_CONFIG_SCHEMA}\n\n")
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+    config_path.write_text(
+        f"# yaml-language-server: $schema=../../{STACK_CONFIG_SCHEMA}\n\n" + _dump_yaml(config)
+    )
 
     if source_type == "local":
         compose_file = stack_dir / "docker-compose.yml"
@@ -228,17 +247,80 @@ def new_command() -> None:
     console.print(f"[green]Created stack '{name}' at {stack_dir}[/green]")
 
 
-def _add_to_gitignore(entry: str) -> None:
-    """Add an entry to .gitignore if not already present."""
-    gitignore_path = Path(".gitignore")
-
-    if gitignore_path.exists():
-        content = gitignore_path.read_text()
-        lines = content.splitlines()
-        if entry not in lines:
-            with open(gitignore_path, "a") as f:
-                if content and not content.endswith("\n"):
-                    f.write("\n")
-                f.write(f"{entry}\n")
-    else:
-        gitignore_path.write_text(f"{entry}\n")
+def _ask_required(prompt: str, password: bool = False) -> str:
+    """Prompt for a value, asking again in place while the answer is empty.
+
+    Args:
+        prompt: Prompt text.
+        password: Hide the input.
+
+    Returns:
+        The non-empty answer.
+    """
+    from rich.prompt import InvalidResponse, Prompt
+
+    class RequiredPrompt(Prompt):
+        def process_response(self, value: str) -> str:
+            if not value.strip():
+                raise InvalidResponse(f"[red]{prompt} cannot be empty[/red]")
+            return super().process_response(value)
+
+    return RequiredPrompt.ask(prompt, password=password)
+
+
+def _read_root_domain(config_path: Path) -> str | None:
+    """Read root_domain from surek.yml without parsing the whole file.
+
+    Only the top-level root_domain line is parsed as YAML, which still
+    handles quoting and trailing comments.
+
+    Args:
+        config_path: Path to surek.yml.
+
+    Returns:
+        The root domain, or None if the file doesn't set one.
+    """
+    with open(config_path) as f:
+        for line in f:
+            if line.startswith("root_domain:"):
+                data = _load_yaml(line)
+                if isinstance(data, dict) and data.get("root_domain"):
+                    return str(data["root_domain"])
+                return None
+    return None
+
+
+def _load_yaml(stream: str | TextIO) -> object:
+    """Parse YAML safely, using libyaml's parser when available."""
+    import yaml
+
+    from surek.utils.yaml import SafeLoader
+
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def _dump_yaml(data: dict[str, object]) -> str:
+    """Render data as block-style YAML, using libyaml's emitter when available."""
+    import yaml
+
+    from surek.utils.yaml import SafeDumper
+
+    return yaml.dump(data, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
+
+
+def _add_to_gitignore(*entries: str) -> None:
+    """Add entries to .gitignore, skipping those already present.
+
+    Args:
+        *entries: Lines to add.
+    """
+    # "a+" creates the file if needed and lets us read and append with one open
+    with open(".gitignore", "a+") as f:
+        f.seek(0)
+        content = f.read()
+        existing = set(content.splitlines())
+        missing = [entry for entry in dict.fromkeys(entries) if entry not in existing]
+        if not missing:
+            return
+        prefix = "\n" if content and not content.endswith("\n") else ""
+        f.write(prefix + "\n".join(missing) + "\n")
@@ -1,39 +1,45 @@
 """Stack management commands."""
 
 import contextlib
-import json
+import os
 import shutil
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
-from rich.console import Console
-from rich.prompt import Confirm
-from rich.table import Table
+from rich.text import Text
 
-from surek.core.config import load_config, load_stack_config
-from surek.core.deploy import deploy_stack, deploy_system_stack, start_stack, stop_stack
 from surek.core.docker import (
-    StackStatusDetailed,
     ensure_surek_network,
     get_stack_status_detailed,
+    get_stacks_status_detailed,
+    prune_docker_resources,
     run_docker_compose,
 )
-from surek.core.stacks import (
-    RESERVED_STACK_NAMES,
-    SYSTEM_STACK_NAME,
-    get_available_stacks,
-    get_stack_by_name,
-)
-from surek.exceptions import StackConfigError, SurekError
-from surek.utils.logging import format_bytes, run_command
+from surek.exceptions import DockerError, StackConfigError, SurekError
+from surek.utils.logging import format_bytes, get_console, print_json
 from surek.utils.paths import get_data_dir, get_stack_project_dir, get_system_dir
 
-console = Console()
+if TYPE_CHECKING:
+    from surek.models.config import SurekConfig
+
+# Styled prefixes are built once, and the text printed after them is passed with
+# markup=False, so messages skip markup parsing and may contain brackets
+ERROR_PREFIX = Text("Error:", style="red")
+OK_MARK = Text("✓", style="green")
+FAIL_MARK = Text("✗", style="red")
+
+# Colors for stack status texts, keyed by the marker they start with
+STATUS_COLORS = {"✓": "green", "×": "red", "⚠": "yellow"}
+SERVICE_STATUS_COLORS = {"running": "green", "exited": "red"}
 
 
 def _is_system_stack(stack_name: str) -> bool:
     """Check if the stack name refers to the system stack."""
+    from surek.core.stacks import RESERVED_STACK_NAMES
+
     return stack_name.lower() in RESERVED_STACK_NAMES
 
 
@@ -43,6 +49,9 @@ def _ensure_system_running() -> None:
     Raises:
         typer.Exit: If system stack is not running.
     """
+    from surek.core.stacks import SYSTEM_STACK_NAME
+
+    console = get_console()
     try:
         status = get_stack_status_detailed(SYSTEM_STACK_NAME, include_stats=False)
         running_count = sum(1 for svc in status.services if svc.status == "running")
@@ -67,11 +76,33 @@ def _ensure_system_running() -> None:
         raise typer.Exit(1) from None
 
 
+def _redeploy_system(surek_config: "SurekConfig") -> None:
+    """Stop the system stack if it's running and deploy it again.
+
+    Args:
+        surek_config: The main Surek configuration.
+    """
+    from surek.core.config import load_stack_config
+    from surek.core.deploy import deploy_system_stack, stop_stack
+    from surek.core.stacks import SYSTEM_STACK_NAME
+
+    ensure_surek_network()
+
+    # Stopping goes through docker compose, skip it when there is nothing to stop
+    status = get_stack_status_detailed(SYSTEM_STACK_NAME, include_stats=False)
+    if any(svc.status == "running" for svc in status.services):
+        system_config = load_stack_config(get_system_dir() / "surek.stack.yml")
+        stop_stack(system_config, silent=True)
+
+    deploy_system_stack(surek_config)
+
+
 def _complete_stack_name(incomplete: str) -> list[str]:
     """Provide autocompletion for stack names."""
+    from surek.core.stacks_cache import get_cached_stack_names
+
     try:
-        stacks = get_available_stacks()
-        names = [s.config.name for s in stacks if s.valid and s.config]
+        names = get_cached_stack_names()
         # Add 'system' for system stack
         names.append("system")
         return [name for name in names if name.startswith(incomplete)]
@@ -88,25 +119,24 @@ def deploy(
     pull: bool = typer.Option(False, "--pull", help="Force re-pull sources and Docker images"),
 ) -> None:
     """Deploy a stack (pull sources, transform compose, start containers)."""
+    from surek.core.config import load_config
+    from surek.core.deploy import deploy_stack
+    from surek.core.stacks import get_stack_by_name
+
+    console = get_console()
     try:
         surek_config = load_config()
 
         if _is_system_stack(stack_name):
             console.print("Deploying system containers...")
-            ensure_surek_network()
-
-            system_dir = get_system_dir()
-            system_config = load_stack_config(system_dir / "surek.stack.yml")
-            stop_stack(system_config, silent=True)
-
-            deploy_system_stack(surek_config)
+            _redeploy_system(surek_config)
         else:
             _ensure_system_running()
             stack = get_stack_by_name(stack_name)
             console.print(f"Loaded stack config from {stack.path}")
             deploy_stack(stack, surek_config, pull=pull)
     except SurekError as e:
-        console.print(f"[red]Error:[/red] {e}")
+        console.print(ERROR_PREFIX, str(e), markup=False)
         raise typer.Exit(1) from None
 
 
@@ -118,18 +148,17 @@ def start(
     ),
 ) -> None:
     """Start an already deployed stack without re-transformation."""
+    from surek.core.config import load_config
+    from surek.core.deploy import start_stack
+    from surek.core.stacks import get_stack_by_name
+
+    console = get_console()
     try:
         if _is_system_stack(stack_name):
             # Start system stack (same as deploy for system)
             surek_config = load_config()
             console.print("Starting system containers...")
-            ensure_surek_network()
-
-            system_dir = get_system_dir()
-            system_config = load_stack_config(system_dir / "surek.stack.yml")
-            stop_stack(system_config, silent=True)
-
-            deploy_system_stack(surek_config)
+            _redeploy_system(surek_config)
         else:
             _ensure_system_running()
             stack = get_stack_by_name(stack_name)
@@ -137,7 +166,7 @@ def start(
             if stack.config:
                 start_stack(stack.config)
     except SurekError as e:
-        console.print(f"[red]Error:[/red] {e}")
+        console.print(ERROR_PREFIX, str(e), markup=False)
         raise typer.Exit(1) from None
 
 
@@ -149,6 +178,11 @@ def stop(
     ),
 ) -> None:
     """Stop a running stack."""
+    from surek.core.config import load_stack_config
+    from surek.core.deploy import stop_stack
+    from surek.core.stacks import get_stack_by_name
+
+    console = get_console()
     try:
         if _is_system_stack(stack_name):
             system_dir = get_system_dir()
@@ -160,20 +194,57 @@ def stop(
             if stack.config:
                 stop_stack(stack.config, silent=False)
     except SurekError as e:
-        console.print(f"[red]Error:[/red] {e}")
+        console.print(ERROR_PREFIX, str(e), markup=False)
         raise typer.Exit(1) from None
 
 
+@dataclass(slots=True)
+class _StatusRow:
+    """A single row of the `status` output."""
+
+    name: str
+    status: str
+    health: str
+    endpoints: list[str] = field(default_factory=list)
+    cpu: str = "-"
+    memory: str = "-"
+    error: str | None = None
+
+    def to_dict(self, stats: bool) -> dict[str, object]:
+        """Convert the row to its JSON representation.
+
+        Args:
+            stats: Whether CPU and memory columns were requested.
+
+        Returns:
+            Dict with the row fields, omitting unused ones.
+        """
+        result: dict[str, object] = {
+            "name": self.name,
+            "status": self.status,
+            "health": self.health,
+            "endpoints": self.endpoints,
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        if stats:
+            result["cpu"] = self.cpu
+            result["memory"] = self.memory
+        return result
+
+
 def status(
     json_output: bool = typer.Option(False, "--json", help="Output as JSON"),
     stats: bool = typer.Option(False, "--stats", "-s", help="Include CPU/memory stats (slower)"),
 ) -> None:
     """Show status of all stacks with health and resource usage."""
+    from surek.core.config import load_config
+    from surek.core.stacks import SYSTEM_STACK_NAME, get_available_stacks
+
+    console = get_console()
     try:
         surek_config = load_config()
 
-        results = []
-
         stack_names_to_query: list[str] = [SYSTEM_STACK_NAME]
         user_stacks = []
         try:
@@ -184,124 +255,92 @@ def status(
         except SurekError:
             pass
 
-        # Fetch status for all stacks (in parallel when stats enabled)
-        status_by_name: dict[str, StackStatusDetailed] = {}
-        if stats and len(stack_names_to_query) > 1:
-            with ThreadPoolExecutor(max_workers=min(len(stack_names_to_query), 10)) as executor:
-                futures = {
-                    executor.submit(get_stack_status_detailed, name, True): name
-                    for name in stack_names_to_query
-                }
-                for future in as_completed(futures):
-                    name = futures[future]
-                    status_by_name[name] = future.result()
-        else:
-            for name in stack_names_to_query:
-                status_by_name[name] = get_stack_status_detailed(name, include_stats=stats)
+        # One container listing covers all stacks
+        status_by_name = get_stacks_status_detailed(stack_names_to_query, include_stats=stats)
 
         system_status = status_by_name[SYSTEM_STACK_NAME]
-        system_result: dict[str, object] = {
-            "name": "system",
-            "status": system_status.status_text,
-            "health": system_status.health_summary,
-            "endpoints": [],
-        }
-        if stats:
-            system_result["cpu"] = f"{system_status.cpu_percent:.1f}%"
-            system_result["memory"] = format_bytes(system_status.memory_bytes)
-        results.append(system_result)
+        rows = [
+            _StatusRow(
+                name="system",
+                status=system_status.status_text,
+                health=system_status.health_summary,
+                cpu=f"{system_status.cpu_percent:.1f}%",
+                memory=format_bytes(system_status.memory_bytes),
+            )
+        ]
 
         for stack in user_stacks:
             if not stack.valid:
-                result: dict[str, object] = {
-                    "name": str(stack.path.parent.name),
-                    "status": "Invalid config",
-                    "health": "-",
-                    "endpoints": [],
-                    "error": stack.error or "Unknown error",
-                }
-                if stats:
-                    result["cpu"] = "-"
-                    result["memory"] = "-"
-                results.append(result)
+                rows.append(
+                    _StatusRow(
+                        name=stack.path.parent.name,
+                        status="Invalid config",
+                        health="-",
+                        error=stack.error or "Unknown error",
+                    )
+                )
                 continue
 
             if stack.config:
                 stack_status = status_by_name[stack.config.name]
                 # Expand domains with root
-                endpoints: list[str] = []
-                if stack.config.public:
-                    for ep in stack.config.public:
-                        domain = ep.domain.replace("<root>", surek_config.root_domain)
-                        endpoints.append(f"https://{domain}")
-
-                stack_result: dict[str, object] = {
-                    "name": stack.config.name,
-                    "status": stack_status.status_text,
-                    "health": stack_status.health_summary,
-                    "endpoints": endpoints,
-                }
-                if stats:
-                    stack_result["cpu"] = f"{stack_status.cpu_percent:.1f}%"
-                    stack_result["memory"] = format_bytes(stack_status.memory_bytes)
-                results.append(stack_result)
+                endpoints = [
+                    f"https://{ep.domain.replace('<root>', surek_config.root_domain)}"
+                    for ep in stack.config.public
+                ]
+                rows.append(
+                    _StatusRow(
+                        name=stack.config.name,
+                        status=stack_status.status_text,
+                        health=stack_status.health_summary,
+                        endpoints=endpoints,
+                        cpu=f"{stack_status.cpu_percent:.1f}%",
+                        memory=format_bytes(stack_status.memory_bytes),
+                    )
+                )
 
         if json_output:
-            console.print(json.dumps(results, indent=2))
-        else:
-            table = Table(title="Surek stacks status")
-            table.add_column("Stack", style="cyan")
-            table.add_column("Status")
-            table.add_column("Health")
+            print_json([row.to_dict(stats) for row in rows])
+            return
+
+        from rich.table import Table
+
+        table = Table(title="Surek stacks status")
+        table.add_column("Stack", style="cyan")
+        table.add_column("Status")
+        table.add_column("Health")
+        if stats:
+            table.add_column("CPU")
+            table.add_column("Memory")
+        table.add_column("Endpoints", style="dim")
+
+        invalid_rows: list[_StatusRow] = []
+        for row in rows:
+            if row.error is not None:
+                invalid_rows.append(row)
+
+            status_text = row.status
+            color = "red" if row.error is not None else STATUS_COLORS.get(status_text[:1])
+            if color:
+                status_text = f"[{color}]{status_text}[/{color}]"
+
+            endpoints_str = ", ".join(row.endpoints) or "-"
             if stats:
-                table.add_column("CPU")
-                table.add_column("Memory")
-            table.add_column("Endpoints", style="dim")
-
-            for result in results:
-                status_text = str(result["status"])
-                if "✓" in status_text:
-                    status_text = f"[green]{status_text}[/green]"
-                elif "×" in status_text:
-                    status_text = f"[red]{status_text}[/red]"
-                elif "⚠" in status_text:
-                    status_text = f"[yellow]{status_text}[/yellow]"
-                elif "Invalid" in status_text:
-                    status_text = f"[red]{status_text}[/red]"
-
-                endpoints_obj = result.get("endpoints", [])
-                endpoints_list: list[str] = endpoints_obj if isinstance(endpoints_obj, list) else []
-                endpoints_str = ", ".join(endpoints_list) if endpoints_list else "-"
-
-                if stats:
-                    table.add_row(
-                        str(result["name"]),
-                        status_text,
-                        str(result["health"]),
-                        str(result.get("cpu", "-")),
-                        str(result.get("memory", "-")),
-                        endpoints_str,
-                    )
-                else:
-                    table.add_row(
-                        str(result["name"]),
-                        status_text,
-                        str(result["health"]),
-                        endpoints_str,
-                    )
+                table.add_row(row.name, status_text, row.health, row.cpu, row.memory, endpoints_str)
+            else:
+                table.add_row(row.name, status_text, row.health, endpoints_str)
 
-            console.print(table)
+        console.print(table)
 
-            # Show errors for invalid stacks
-            for result in results:
-                if "error" in result:
-                    console.print(
-                        f"\n[yellow]Warning:[/yellow] Stack '{result['name']}' has invalid config: {result['error']}"
-                    )
-                    console.print(f"  Run: surek validate stacks/{result['name']}/surek.stack.yml")
+        # Show errors for invalid stacks
+        for row in invalid_rows:
+            console.print(
+                f"\n[yellow]Warning:[/yellow] Stack '{row.name}' has invalid config: {row.error}"
+            )
+            console.print(f"  Run: surek validate stacks/{row.name}/surek.stack.yml")
 
     except SurekError as e:
-        console.print(f"[red]Error:[/red] {e}")
+        console.print(ERROR_PREFIX, str(e), markup=False)
         raise typer.Exit(1) from None
 
 
@@ -313,6 +352,12 @@ def info(
     json_output: bool = typer.Option(False, "--json", help="Output as JSON"),
 ) -> None:
     """Show detailed information about a stack."""
+    from rich.table import Table
+
+    from surek.core.config import load_config
+    from surek.core.stacks import SYSTEM_STACK_NAME, get_stack_by_name
+
+    console = get_console()
     try:
         surek_config = load_config()
 
@@ -355,10 +400,8 @@ def info(
 
                     for svc in stack_status.services:
                         status_text = svc.status
-                        if svc.status == "running":
-                            status_text = f"[green]{status_text}[/green]"
-                        elif svc.status == "exited":
-                            status_text = f"[red]{status_text}[/red]"
+                        if color := SERVICE_STATUS_COLORS.get(svc.status):
+                            status_text = f"[{color}]{status_text}[/{color}]"
 
                         services_table.add_row(
                             svc.name,
@@ -424,10 +467,8 @@ def info(
 
                     for svc in stack_status.services:
                         status_text = svc.status
-                        if svc.status == "running":
-                            status_text = f"[green]{status_text}[/green]"
-                        elif svc.status == "exited":
-                            status_text = f"[red]{status_text}[/red]"
+                        if color := SERVICE_STATUS_COLORS.get(svc.status):
+                            status_text = f"[{color}]{status_text}[/{color}]"
 
                         services_table.add_row(
                             svc.name,
@@ -451,19 +492,20 @@ def info(
             else:
                 project_dir = get_stack_project_dir(stack.config.name)  # type: ignore[union-attr]
             compose_file = project_dir / "docker-compose.surek.yml"
-            if compose_file.exists():
+            if compose_file.is_file():
                 try:
+                    if not json_output:
+                        # Stream straight to the terminal, logs don't need to pass
+                        # through rich
+                        console.print("\n[bold]Recent Logs:[/bold]")
                     logs_output = run_docker_compose(
                         compose_file=compose_file,
                         project_dir=project_dir,
                         command="logs",
                         args=["--tail", "40"],
-                        capture_output=True,
+                        capture_output=json_output,
                         silent=True,
                     )
-                    if not json_output:
-                        console.print("\n[bold]Recent Logs:[/bold]")
-                        console.print(logs_output)
                 except SurekError as e:
                     if not json_output:
                         console.print(f"[yellow]Could not fetch logs: {e}[/yellow]")
@@ -473,10 +515,10 @@ def info(
         if json_output:
             if show_logs:
                 result["logs"] = logs_output
-            console.print(json.dumps(result, indent=2))
+            print_json(result)
 
     except SurekError as e:
-        console.print(f"[red]Error:[/red] {e}")
+        console.print(ERROR_PREFIX, str(e), markup=False)
         raise typer.Exit(1) from None
 
 
@@ -491,19 +533,22 @@ def logs(
     tail: int = typer.Option(100, "-t", "--tail", help="Output last N lines"),
 ) -> None:
     """View logs for a stack or specific service."""
+    from surek.core.stacks import SYSTEM_STACK_NAME, get_stack_by_name
+
+    console = get_console()
     try:
         # Handle system stack specially
         if _is_system_stack(stack_name):
-            project_dir = get_stack_project_dir(SYSTEM_STACK_NAME)
-            compose_file = project_dir / "docker-compose.surek.yml"
+            project_name = SYSTEM_STACK_NAME
         else:
             stack = get_stack_by_name(stack_name)
             if not stack.config:
                 raise SurekError("Invalid stack config")
-            project_dir = get_stack_project_dir(stack.config.name)
-            compose_file = project_dir / "docker-compose.surek.yml"
+            project_name = stack.config.name
 
-        if not compose_file.exists():
+        project_dir = get_stack_project_dir(project_name)
+        compose_file = project_dir / "docker-compose.surek.yml"
+        if not compose_file.is_file():
             raise SurekError(f"Stack '{stack_name}' is not deployed")
 
         args = ["--tail", str(tail)]
@@ -512,27 +557,17 @@ def logs(
         if service:
             args.append(service)
 
-        # For follow mode, we can't capture output - let it stream
-        if follow:
-            run_docker_compose(
-                compose_file=compose_file,
-                project_dir=project_dir,
-                command="logs",
-                args=args,
-            )
-        else:
-            output = run_docker_compose(
-                compose_file=compose_file,
-                project_dir=project_dir,
-                command="logs",
-                args=args,
-                capture_output=True,
-                silent=True,
-            )
-            console.print(output)
+        # Let docker stream logs straight to the terminal
+        run_docker_compose(
+            compose_file=compose_file,
+            project_dir=project_dir,
+            command="logs",
+            args=args,
+            silent=not follow,
+        )
 
     except SurekError as e:
-        console.print(f"[red]Error:[/red] {e}")
+        console.print(ERROR_PREFIX, str(e), markup=False)
         raise typer.Exit(1) from None
 
 
@@ -540,18 +575,21 @@ def validate(
     stack_path: Path = typer.Argument(..., help="Path to surek.stack.yml file"),
 ) -> None:
     """Validate a stack configuration file."""
+    from surek.core.config import load_stack_config
+
+    console = get_console()
     try:
         config = load_stack_config(stack_path)
-        console.print("[green]✓[/green] Stack config is valid")
-        console.print(f"  Name: {config.name}")
-        console.print(f"  Source: {config.source.pretty}")
+        console.print(OK_MARK, "Stack config is valid")
+        console.print(f"  Name: {config.name}", markup=False)
+        console.print(f"  Source: {config.source.pretty}", markup=False)
         if config.public:
             console.print(f"  Endpoints: {len(config.public)}")
             for ep in config.public:
-                console.print(f"    • {ep.domain} → {ep.target}")
+                console.print(f"    • {ep.domain} → {ep.target}", markup=False)
     except StackConfigError as e:
-        console.print(f"[red]✗[/red] Invalid stack config: {stack_path}")
-        console.print(f"  {e}")
+        console.print(FAIL_MARK, f"Invalid stack config: {stack_path}", markup=False)
+        console.print(f"  {e}", markup=False)
         raise typer.Exit(1) from None
 
 
@@ -562,6 +600,13 @@ def reset(
     force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation prompt"),
 ) -> None:
     """Reset a stack by stopping it, removing volumes, and cleaning up files."""
+    from rich.prompt import Confirm
+
+    from surek.core.config import load_stack_config
+    from surek.core.deploy import stop_stack
+    from surek.core.stacks import get_stack_by_name
+
+    console = get_console()
     try:
         if _is_system_stack(stack_name):
             system_dir = get_system_dir()
@@ -581,7 +626,9 @@ def reset(
         console.print("\nThis will:")
         console.print("  • Stop all containers")
         console.print(f"  • Remove project files: {project_dir}")
-        if volumes_dir.exists():
+        # Checked once, so only volume data the user was warned about gets deleted
+        has_volumes = volumes_dir.exists()
+        if has_volumes:
             console.print(f"  • [red]Delete all volume data:[/red] {volumes_dir}")
 
         if not force and not Confirm.ask(
@@ -596,20 +643,21 @@ def reset(
             stop_stack(config, silent=True)
 
         # Remove project directory
-        if project_dir.exists():
-            console.print(f"Removing {project_dir}...")
+        with contextlib.suppress(FileNotFoundError):
             shutil.rmtree(project_dir)
+            console.print(f"Removed {project_dir}")
 
         # Remove volumes
-        if volumes_dir.exists():
+        if has_volumes:
             console.print(f"Removing {volumes_dir}...")
             shutil.rmtree(volumes_dir)
 
-        console.print(f"\n[green]✓[/green] Stack '{display_name}' has been reset")
+        console.print()
+        console.print(OK_MARK, f"Stack '{display_name}' has been reset", markup=False)
         console.print(f"  Run 'surek deploy {display_name}' to redeploy")
 
     except SurekError as e:
-        console.print(f"[red]Error:[/red] {e}")
+        console.print(ERROR_PREFIX, str(e), markup=False)
         raise typer.Exit(1) from None
 
 
@@ -619,12 +667,27 @@ def _find_orphan_volume_folders() -> list[tuple[str, str]]:
     Returns:
         List of (stack_name, folder_path) tuples for orphan folders.
     """
+    from surek.core.stacks import SYSTEM_STACK_NAME, get_available_stacks
+
     volumes_base = get_data_dir() / "volumes"
     if not volumes_base.exists():
         return []
 
-    # Get all known stack names (including system and invalid stacks)
-    known_stacks = {SYSTEM_STACK_NAME}
+    # Scan the folders first, loading every stack config is only needed when
+    # there is something besides the system stack to check.
+    # scandir entries carry the file type, so is_dir() doesn't need a stat call.
+    # Symlinks are skipped, rmtree refuses to remove them anyway.
+    with os.scandir(volumes_base) as entries:
+        candidates = [
+            (entry.name, entry.path)
+            for entry in entries
+            if entry.is_dir(follow_symlinks=False) and entry.name != SYSTEM_STACK_NAME
+        ]
+    if not candidates:
+        return []
+
+    # Get all known stack names (including invalid stacks)
+    known_stacks: set[str] = set()
     try:
         stacks = get_available_stacks()
         for stack in stacks:
@@ -638,12 +701,7 @@ def _find_orphan_volume_folders() -> list[tuple[str, str]]:
         pass
 
     # Find folders that don't match any known stack
-    orphans: list[tuple[str, str]] = []
-    for folder in volumes_base.iterdir():
-        if folder.is_dir() and folder.name not in known_stacks:
-            orphans.append((folder.name, str(folder)))
-
-    return orphans
+    return [(name, path) for name, path in candidates if name not in known_stacks]
 
 
 def prune(
@@ -651,6 +709,9 @@ def prune(
     force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation prompt"),
 ) -> None:
     """Remove unused Docker resources (containers, networks, images)."""
+    from rich.prompt import Confirm
+
+    console = get_console()
     try:
         # Find orphan volume folders
         orphan_folders = _find_orphan_volume_folders()
@@ -670,42 +731,33 @@ def prune(
 
         console.print("Pruning unused Docker resources...")
 
-        # Prune containers
-        result = run_command(
-            ["docker", "container", "prune", "-f"], capture_output=True, check=False
-        )
-        if result.returncode == 0:
-            console.print("[green]✓[/green] Removed unused containers")
-
-        # Prune networks
-        result = run_command(["docker", "network", "prune", "-f"], capture_output=True, check=False)
-        if result.returncode == 0:
-            console.print("[green]✓[/green] Removed unused networks")
-
-        # Prune images
-        result = run_command(["docker", "image", "prune", "-f"], capture_output=True, check=False)
-        if result.returncode == 0:
-            console.print("[green]✓[/green] Removed unused images")
-
-        # Prune volumes if requested
-        if volumes:
-            result = run_command(
-                ["docker", "volume", "prune", "-f"], capture_output=True, check=False
-            )
-            if result.returncode == 0:
-                console.print("[green]✓[/green] Removed unused Docker volumes")
-
-            # Remove orphan volume folders
-            if orphan_folders:
-                for name, path in orphan_folders:
+        # One pass over the Docker API covers containers, networks, images (and volumes)
+        try:
+            reclaimed = prune_docker_resources(volumes=volumes)
+            pruned = "containers, networks and images"
+            if volumes:
+                pruned = "containers, networks, images and volumes"
+            console.print(OK_MARK, f"Removed unused {pruned}")
+            console.print(f"  Total reclaimed space: {format_bytes(reclaimed)}")
+        except DockerError as e:
+            console.print(f"[yellow]Warning:[/yellow] Docker prune failed: {e}")
+
+        # Remove orphan volume folders (in parallel, deletion is bound by syscalls)
+        if volumes and orphan_folders:
+            with ThreadPoolExecutor(max_workers=min(len(orphan_folders), 4)) as executor:
+                futures = {
+                    executor.submit(shutil.rmtree, path): name for name, path in orphan_folders
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
                     try:
-                        shutil.rmtree(path)
-                        console.print(f"[green]✓[/green] Removed orphan folder: {name}")
+                        future.result()
+                        console.print(OK_MARK, f"Removed orphan folder: {name}", markup=False)
                     except OSError as e:
                         console.print(f"[yellow]Warning:[/yellow] Could not remove {name}: {e}")
 
         console.print("\n[green]Prune completed[/green]")
 
     except Exception as e:
-        console.print(f"[red]Error:[/red] {e}")
+        console.print(ERROR_PREFIX, str(e), markup=False)
         raise typer.Exit(1) from None
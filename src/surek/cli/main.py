@@ -1,13 +1,13 @@
 """Main CLI entry point for Surek."""
 
+import sys
+
 import typer
-from rich.console import Console
 
 from surek import __version__
 from surek.cli.commands import backup, init, stack
 from surek.exceptions import SurekError
-
-console = Console()
+from surek.utils.logging import get_console
 
 app = typer.Typer(
     name="surek",
@@ -37,7 +37,7 @@ app.command(name="prune")(stack.prune)
 def version_callback(value: bool) -> None:
     """Print version and exit."""
     if value:
-        console.print(f"surek {__version__}")
+        get_console().print(f"surek {__version__}")
         raise typer.Exit()
 
 
@@ -48,9 +48,11 @@ def help_llm_callback(value: bool) -> None:
             from importlib import resources
 
             docs_path = resources.files("surek.resources") / "llm_docs.md"
-            console.print(docs_path.read_text())
+            # Raw bytes, so rich doesn't parse the markdown for markup
+            sys.stdout.buffer.write(docs_path.read_bytes())
+            sys.stdout.flush()
         except FileNotFoundError:
-            console.print("[yellow]LLM documentation not yet available.[/yellow]")
+            get_console().print("[yellow]LLM documentation not yet available.[/yellow]")
         raise typer.Exit()
 
 
@@ -61,9 +63,11 @@ def help_readme_callback(value: bool) -> None:
             from importlib import resources
 
             readme_path = resources.files("surek.resources") / "README.md"
-            console.print(readme_path.read_text())
+            # Raw bytes, so rich doesn't parse the markdown for markup
+            sys.stdout.buffer.write(readme_path.read_bytes())
+            sys.stdout.flush()
         except FileNotFoundError:
-            console.print("[yellow]README not available.[/yellow]")
+            get_console().print("[yellow]README not available.[/yellow]")
         raise typer.Exit()
 
 
@@ -95,7 +99,7 @@ def main(
 
             run_tui()
         except SurekError as e:
-            console.print(f"[red]Error:[/red] {e}")
+            get_console().print(f"[red]Error:[/red] {e}")
             raise typer.Exit(1) from None
 
 
@@ -104,7 +108,7 @@ def run() -> None:
     try:
         app()
     except SurekError as e:
-        console.print(f"[red]Error:[/red] {e}")
+        get_console().print(f"[red]Error:[/red] {e}")
         raise typer.Exit(1) from None
 
 
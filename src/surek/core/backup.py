@@ -1,19 +1,58 @@
 """Backup operations and S3 integration."""
 
+import contextlib
+import os
+import shutil
+import signal
+import subprocess
+import threading
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Literal
-
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
+from typing import IO, TYPE_CHECKING, Literal
 
 from surek.core.stacks import SYSTEM_STACK_NAME
 from surek.exceptions import BackupError
 from surek.models.config import BackupConfig
-from surek.utils.logging import console, print_dim, run_command
+from surek.utils.env import read_env_file
+from surek.utils.logging import get_console, print_dim
+from surek.utils.paths import get_stack_project_dir
+
+if TYPE_CHECKING:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+
+# boto3 takes a few hundred milliseconds to import, so it's only imported
+# inside the functions that talk to S3
 
 BackupType = Literal["daily", "weekly", "monthly", "manual", "unknown"]
+BACKUP_TYPES_BY_PREFIX: dict[str, BackupType] = {
+    "daily": "daily",
+    "weekly": "weekly",
+    "monthly": "monthly",
+    "manual": "manual",
+}
+
+MB = 1024 * 1024
+
+# Lines of backup output kept for the error message when a backup fails
+BACKUP_ERROR_TAIL_LINES = 20
+
+# Archives starting with the gzip magic are plain tarballs and skip gpg
+GZIP_MAGIC = b"\x1f\x8b"
+
+# The passphrase goes to gpg through a pipe rather than argv, where any local
+# user could read it from the process list
+GPG_DECRYPT_ARGS = ("--batch", "--yes", "--decrypt")
+
+# tar's complaints about member patterns that matched nothing in the archive
+TAR_MISSING_MEMBER_ERRORS = (
+    "Not found in archive",
+    "Exiting with failure status due to previous errors",
+)
 
 
 @dataclass
@@ -26,8 +65,30 @@ class BackupInfo:
     created: datetime
 
 
-def get_s3_client(config: BackupConfig) -> boto3.client:  # type: ignore[valid-type]
-    """Create an S3 client for backup operations.
+@cache
+def get_transfer_config() -> "TransferConfig":
+    """Get the S3 transfer settings for downloads.
+
+    Large backups are downloaded as parallel ranged GETs.
+
+    Returns:
+        Shared boto3 transfer configuration.
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=8 * MB,
+        multipart_chunksize=16 * MB,
+        max_concurrency=10,
+        use_threads=True,
+    )
+
+
+def get_s3_client(config: BackupConfig) -> "boto3.client":  # type: ignore[valid-type]
+    """Get an S3 client for backup operations.
+
+    Clients are reused for the same credentials, so repeated operations
+    share the connection pool instead of doing a new TLS handshake.
 
     Args:
         config: Backup configuration with S3 credentials.
@@ -35,19 +96,28 @@ def get_s3_client(config: BackupConfig) -> boto3.client:  # type: ignore[valid-t
     Returns:
         Configured boto3 S3 client.
     """
+    return _create_s3_client(config.s3_endpoint, config.s3_access_key, config.s3_secret_key)
+
+
+@lru_cache(maxsize=4)
+def _create_s3_client(endpoint: str, access_key: str, secret_key: str) -> "boto3.client":  # type: ignore[valid-type]
+    """Create an S3 client for the given endpoint and credentials."""
+    import boto3
+
     return boto3.client(
         "s3",
-        endpoint_url=f"https://{config.s3_endpoint}",
-        aws_access_key_id=config.s3_access_key,
-        aws_secret_access_key=config.s3_secret_key,
+        endpoint_url=f"https://{endpoint}",
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
     )
 
 
-def list_backups(config: BackupConfig) -> list[BackupInfo]:
+def list_backups(config: BackupConfig, limit: int | None = None) -> list[BackupInfo]:
     """List all backups in S3.
 
     Args:
         config: Backup configuration.
+        limit: Optional maximum number of backups to return.
 
     Returns:
         List of backup information, sorted by date (newest first).
@@ -55,56 +125,57 @@ def list_backups(config: BackupConfig) -> list[BackupInfo]:
     Raises:
         BackupError: If S3 operation fails.
     """
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
         s3 = get_s3_client(config)
-        response = s3.list_objects_v2(Bucket=config.s3_bucket)  # type: ignore[attr-defined]
+        # A single list_objects_v2 call returns at most 1000 keys
+        paginator = s3.get_paginator("list_objects_v2")  # type: ignore[attr-defined]
+        pages = paginator.paginate(Bucket=config.s3_bucket, PaginationConfig={"PageSize": 1000})
 
         backups = []
-        for obj in response.get("Contents", []):
-            name = obj["Key"]
-
-            # Determine backup type from filename
-            backup_type: BackupType
-            if name.startswith("daily-"):
-                backup_type = "daily"
-            elif name.startswith("weekly-"):
-                backup_type = "weekly"
-            elif name.startswith("monthly-"):
-                backup_type = "monthly"
-            elif name.startswith("manual-"):
-                backup_type = "manual"
-            else:
-                backup_type = "unknown"
-
-            backups.append(
-                BackupInfo(
-                    name=name,
-                    backup_type=backup_type,
-                    size=obj["Size"],
-                    created=obj["LastModified"],
+        for page in pages:
+            for obj in page.get("Contents", []):
+                name = obj["Key"]
+
+                backups.append(
+                    BackupInfo(
+                        name=name,
+                        # Backup type is the filename prefix, e.g. daily-backup-<timestamp>
+                        backup_type=BACKUP_TYPES_BY_PREFIX.get(name.partition("-")[0], "unknown"),
+                        size=obj["Size"],
+                        created=obj["LastModified"],
+                    )
                 )
-            )
 
-        return sorted(backups, key=lambda b: b.created, reverse=True)
+        # S3 lists keys alphabetically, so the newest backups are only known
+        # once everything is listed
+        backups.sort(key=lambda b: b.created, reverse=True)
+        return backups[:limit] if limit is not None else backups
 
     except (BotoCoreError, ClientError) as e:
         raise BackupError(f"Failed to list backups: {e}") from e
 
 
-def download_backup(config: BackupConfig, backup_name: str, target_path: Path) -> None:
-    """Download a backup from S3.
+def stream_download_backup(config: BackupConfig, backup_name: str, output: IO[bytes]) -> None:
+    """Download a backup from S3 into a file-like object.
+
+    Parts are fetched in parallel but written in order, so output may be
+    a pipe.
 
     Args:
         config: Backup configuration.
         backup_name: Name of the backup file.
-        target_path: Path to save the backup.
+        output: Binary stream to write the backup to.
 
     Raises:
         BackupError: If download fails.
     """
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
         s3 = get_s3_client(config)
-        s3.download_file(config.s3_bucket, backup_name, str(target_path))  # type: ignore[attr-defined]
+        s3.download_fileobj(config.s3_bucket, backup_name, output, Config=get_transfer_config())  # type: ignore[attr-defined]
     except (BotoCoreError, ClientError) as e:
         raise BackupError(f"Failed to download backup: {e}") from e
 
@@ -121,8 +192,8 @@ def trigger_backup() -> None:
     try:
         client = docker.from_env()
 
-        # Find the backup container
-        containers = client.containers.list(
+        # Find the backup container, a plain listing avoids inspecting every match
+        containers = client.api.containers(
             filters={
                 "label": [
                     f"com.docker.compose.project={SYSTEM_STACK_NAME}",
@@ -134,20 +205,38 @@ def trigger_backup() -> None:
         if not containers:
             raise BackupError("Backup container not found. Is system stack running?")
 
-        container = containers[0]
+        # The env files mounted into the container come from the deployed system
+        # project, so they're read here and passed to `backup` without a shell
+        env_file = get_stack_project_dir(SYSTEM_STACK_NAME) / "backup-manual.env"
+        try:
+            environment = read_env_file(env_file)
+        except OSError as e:
+            raise BackupError(f"Failed to read backup configuration {env_file}: {e}") from e
 
+        console = get_console()
         console.print("Triggering manual backup...")
-        exit_code, output = container.exec_run(
-            [
-                "/bin/sh",
-                "-c",
-                "set -a; source /etc/dockervolumebackup/conf.d/backup-manual.env; set +a && backup",
-            ],
-            stream=False,
-        )
-
-        if exit_code != 0:
-            error_msg = output.decode() if output else "Unknown error"
+        exec_id = client.api.exec_create(containers[0]["Id"], ["backup"], environment=environment)[
+            "Id"
+        ]
+
+        # Show the output as it comes and keep only the tail for the error message
+        tail: deque[str] = deque(maxlen=BACKUP_ERROR_TAIL_LINES)
+
+        def show(line: bytes) -> None:
+            text = line.decode(errors="replace")
+            tail.append(text)
+            console.print(text, style="dim", markup=False, highlight=False)
+
+        pending = b""
+        for chunk in client.api.exec_start(exec_id, stream=True):
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                show(line)
+        if pending:
+            show(pending)
+
+        if client.api.exec_inspect(exec_id)["ExitCode"] != 0:
+            error_msg = "\n".join(tail) or "Unknown error"
             raise BackupError(f"Backup failed: {error_msg}")
 
         console.print("[green]Backup completed successfully[/green]")
@@ -156,49 +245,181 @@ def trigger_backup() -> None:
         raise BackupError(f"Docker error: {e}") from e
 
 
-def decrypt_and_extract_backup(
-    backup_path: Path,
+class _ArchiveSink:
+    """Write target that routes a backup archive into tar.
+
+    The first bytes written decide the pipeline: gzip data goes straight to
+    tar, anything else is decrypted by gpg on its way to tar.
+    """
+
+    def __init__(self, tar_stdin: IO[bytes], password: str, tar_cmd: list[str]) -> None:
+        self.gpg: subprocess.Popen[bytes] | None = None
+        self._tar_stdin = tar_stdin
+        self._password = password
+        self._tar_cmd = tar_cmd
+        self._head = b""
+        self._target: IO[bytes] | None = None
+
+    def write(self, data: bytes) -> int:
+        if self._target is None:
+            self._head += data
+            if len(self._head) < len(GZIP_MAGIC):
+                return len(data)
+            self._target = self._open_target()
+            self._target.write(self._head)
+            self._head = b""
+        else:
+            self._target.write(data)
+        return len(data)
+
+    def close(self) -> None:
+        if self._target is None:
+            # Too short to sniff, let tar report the broken archive
+            _print_pipeline(self._tar_cmd)
+            self._tar_stdin.write(self._head)
+            self._target = self._tar_stdin
+        self._target.close()
+
+    def _open_target(self) -> IO[bytes]:
+        if self._head.startswith(GZIP_MAGIC):
+            print_dim("Backup is not encrypted, skipping decryption")
+            _print_pipeline(self._tar_cmd)
+            return self._tar_stdin
+
+        _print_pipeline(["gpg", *GPG_DECRYPT_ARGS], self._tar_cmd)
+        passphrase_fd, write_fd = os.pipe()
+        try:
+            # A passphrase always fits into the pipe buffer, so this never blocks
+            with os.fdopen(write_fd, "wb") as passphrase_pipe:
+                passphrase_pipe.write(self._password.encode() + b"\n")
+            self.gpg = subprocess.Popen(
+                ["gpg", "--passphrase-fd", str(passphrase_fd), *GPG_DECRYPT_ARGS],
+                stdin=subprocess.PIPE,
+                stdout=self._tar_stdin,
+                stderr=subprocess.PIPE,
+                pass_fds=(passphrase_fd,),
+            )
+        except OSError as e:
+            raise BackupError(f"Failed to decrypt backup: {e}") from e
+        finally:
+            os.close(passphrase_fd)
+        # gpg holds its own copy of the pipe, so tar sees EOF once gpg exits
+        self._tar_stdin.close()
+        return self.gpg.stdin  # type: ignore[return-value]
+
+
+def _print_pipeline(*commands: list[str]) -> None:
+    """Echo the commands of a pipeline, without parsing markup in their arguments."""
+    line = " | ".join(" ".join(command) for command in commands)
+    get_console().print(f"$ {line}", style="dim", markup=False, highlight=False)
+
+
+def decrypt_and_extract_stream(
+    download: Callable[[IO[bytes]], None],
     password: str,
     target_dir: Path,
+    members: list[str] | None = None,
 ) -> None:
-    """Decrypt and extract a backup archive.
+    """Decrypt and extract a backup archive while it is being downloaded.
+
+    The download writes into gpg, which pipes straight into tar, so the
+    encrypted and decrypted archives never touch the disk. Unencrypted
+    archives are detected by their gzip header and go to tar directly.
 
     Args:
-        backup_path: Path to the encrypted backup.
+        download: Callable writing the backup into the given stream
+                  (see stream_download_backup).
         password: GPG password for decryption.
         target_dir: Directory to extract to.
+        members: Optional tar wildcard patterns. When given, only matching
+                 archive members are extracted. Patterns matching nothing
+                 aren't an error, they just extract nothing.
 
     Raises:
-        BackupError: If decryption or extraction fails.
+        BackupError: If download, decryption or extraction fails.
     """
-    decrypted_path = backup_path.with_suffix("")
-    gpg_cmd = [
-        "gpg",
-        "--batch",
-        "--yes",
-        "--passphrase",
-        password,
-        "--output",
-        str(decrypted_path),
-        "--decrypt",
-        str(backup_path),
-    ]
-
-    censored_cmd = gpg_cmd.copy()
-    censored_cmd[censored_cmd.index("--passphrase") + 1] = "***"
-    print_dim(f"$ {' '.join(censored_cmd)}")
-
-    try:
-        run_command(gpg_cmd, capture_output=True, silent=True)
-    except Exception as e:
-        raise BackupError(f"Failed to decrypt backup: {e}") from e
+    # pigz inflates, reads, writes and checksums on separate threads, use it when available
+    decompress = ["--use-compress-program=pigz"] if shutil.which("pigz") else ["-z"]
+    tar_cmd = ["tar", *decompress, "-xf", "-", "-C", str(target_dir)]
+    if members:
+        tar_cmd.extend(["--wildcards", *members])
 
     target_dir.mkdir(parents=True, exist_ok=True)
     try:
-        run_command(
-            ["tar", "-xzf", str(decrypted_path), "-C", str(target_dir)], capture_output=True
+        # English messages, so missing members can be told apart from real errors
+        tar = subprocess.Popen(
+            tar_cmd,
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={**os.environ, "LC_ALL": "C"},
         )
-    except Exception as e:
+    except OSError as e:
         raise BackupError(f"Failed to extract backup: {e}") from e
 
-    decrypted_path.unlink()
+    sink = _ArchiveSink(tar.stdin, password, tar_cmd)  # type: ignore[arg-type]
+    feed_errors: list[Exception] = []
+
+    def feed() -> None:
+        try:
+            download(sink)  # type: ignore[arg-type]
+        except BrokenPipeError:
+            # gpg or tar exited early, their stderr explains why
+            pass
+        except Exception as e:
+            feed_errors.append(e)
+        finally:
+            with contextlib.suppress(BrokenPipeError):
+                sink.close()
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+
+    tar_stderr = tar.stderr.read().decode(errors="replace")  # type: ignore[union-attr]
+    tar.wait()
+    feeder.join()
+    gpg = sink.gpg
+    if gpg is not None:
+        gpg_stderr = gpg.stderr.read().decode(errors="replace")  # type: ignore[union-attr]
+        gpg.wait()
+
+    if feed_errors:
+        if isinstance(feed_errors[0], BackupError):
+            raise feed_errors[0]
+        raise BackupError(f"Failed to download backup: {feed_errors[0]}") from feed_errors[0]
+    tar_failed = tar.returncode != 0 and not (members and _only_missing_members(tar_stderr))
+    # When tar gives up midway, gpg fails writing into the closed pipe and only
+    # tar's error tells what went wrong
+    if (
+        gpg is not None
+        and gpg.returncode != 0
+        and not (tar_failed and _is_broken_pipe(gpg.returncode, gpg_stderr))
+    ):
+        raise BackupError(f"Failed to decrypt backup: {gpg_stderr.strip()}")
+    if tar_failed:
+        raise BackupError(f"Failed to extract backup: {tar_stderr.strip()}")
+
+
+def _is_broken_pipe(returncode: int, stderr: str) -> bool:
+    """Check whether a pipeline stage failed because its reader went away.
+
+    Args:
+        returncode: Exit code of the process.
+        stderr: Error output of the process.
+
+    Returns:
+        True if the process was killed by SIGPIPE or reported a broken pipe.
+    """
+    return returncode == -signal.SIGPIPE or "Broken pipe" in stderr
+
+
+def _only_missing_members(tar_stderr: str) -> bool:
+    """Check whether tar only failed because member patterns matched nothing.
+
+    Args:
+        tar_stderr: Error output of tar.
+
+    Returns:
+        True if every error line is about a missing member.
+    """
+    lines = tar_stderr.strip().splitlines()
+    return bool(lines) and all(line.endswith(TAR_MISSING_MEMBER_ERRORS) for line in lines)
@@ -16,6 +16,7 @@ from surek.models.config import SurekConfig
 from surek.models.stack import StackConfig
 from surek.utils.logging import print_warning
 from surek.utils.paths import get_stack_volumes_dir
+from surek.utils.yaml import SafeDumper, SafeLoader
 
 
 def read_compose_file(path: Path) -> dict[str, Any]:
@@ -32,7 +33,7 @@ def read_compose_file(path: Path) -> dict[str, Any]:
     """
     try:
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
         if data is None:
             raise SurekError(f"Compose file is empty: {path}")
         return data
@@ -50,7 +51,7 @@ def write_compose_file(path: Path, spec: dict[str, Any]) -> None:
         spec: The compose specification to write.
     """
     with open(path, "w") as f:
-        yaml.dump(spec, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(spec, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
 
 
 def transform_compose_file(
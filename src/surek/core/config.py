@@ -1,5 +1,6 @@
 """Configuration loading for Surek."""
 
+from functools import lru_cache
 from pathlib import Path
 
 import yaml
@@ -9,6 +10,7 @@ from surek.exceptions import StackConfigError, SurekConfigError
 from surek.models.config import SurekConfig
 from surek.models.stack import StackConfig
 from surek.utils.env import expand_env_vars_in_dict
+from surek.utils.yaml import SafeLoader
 
 
 def load_config(config_path: Path | None = None) -> SurekConfig:
@@ -32,9 +34,46 @@ def load_config(config_path: Path | None = None) -> SurekConfig:
             "Config file not found. Make sure you have surek.yml in current working directory"
         )
 
+    try:
+        stat = config_path.stat()
+    except OSError as e:
+        raise SurekConfigError(f"Could not read config file: {e}") from e
+
+    # Keyed by mtime and size, so an edited file is parsed again
+    return _load_config_cached(config_path.resolve(), stat.st_mtime_ns, stat.st_size)
+
+
+def load_stack_config(path: Path) -> StackConfig:
+    """Load and validate a stack configuration file.
+
+    Args:
+        path: Path to the surek.stack.yml file.
+
+    Returns:
+        Validated StackConfig instance.
+
+    Raises:
+        StackConfigError: If config file is not found or invalid.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise StackConfigError(f"Stack config file not found: {path}") from None
+    except OSError as e:
+        raise StackConfigError(f"Could not read stack config: {e}") from e
+
+    return _load_stack_config_cached(path.resolve(), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _load_config_cached(config_path: Path, mtime_ns: int, size: int) -> SurekConfig:
+    """Parse and validate the main config file.
+
+    The mtime and size arguments are only part of the cache key.
+    """
     try:
         with open(config_path) as f:
-            raw_data = yaml.safe_load(f)
+            raw_data = yaml.load(f, Loader=SafeLoader)
     except yaml.YAMLError as e:
         raise SurekConfigError(f"Invalid YAML in config file: {e}") from e
     except OSError as e:
@@ -56,24 +95,15 @@ def load_config(config_path: Path | None = None) -> SurekConfig:
         raise SurekConfigError(f"Invalid configuration:\n{_format_validation_error(e)}") from e
 
 
-def load_stack_config(path: Path) -> StackConfig:
-    """Load and validate a stack configuration file.
-
-    Args:
-        path: Path to the surek.stack.yml file.
-
-    Returns:
-        Validated StackConfig instance.
+@lru_cache(maxsize=64)
+def _load_stack_config_cached(path: Path, mtime_ns: int, size: int) -> StackConfig:
+    """Parse and validate a stack config file.
 
-    Raises:
-        StackConfigError: If config file is not found or invalid.
+    The mtime and size arguments are only part of the cache key.
     """
-    if not path.exists():
-        raise StackConfigError(f"Stack config file not found: {path}")
-
     try:
         with open(path) as f:
-            raw_data = yaml.safe_load(f)
+            raw_data = yaml.load(f, Loader=SafeLoader)
     except yaml.YAMLError as e:
         raise StackConfigError(f"Invalid YAML in stack config: {e}") from e
     except OSError as e:
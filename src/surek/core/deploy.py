@@ -9,6 +9,7 @@ from surek.core.compose import (
     transform_system_compose,
     write_compose_file,
 )
+from surek.core.config import load_stack_config
 from surek.core.docker import run_docker_compose
 from surek.core.github import (
     get_cached_commit,
@@ -20,7 +21,7 @@ from surek.core.stacks import StackInfo, get_stack_source_dir
 from surek.exceptions import SurekError
 from surek.models.config import SurekConfig
 from surek.models.stack import GitHubSource, StackConfig
-from surek.utils.logging import console, print_dim, print_success
+from surek.utils.logging import get_console, print_dim, print_success
 from surek.utils.paths import get_stack_project_dir, get_system_dir
 
 
@@ -52,7 +53,7 @@ def deploy_stack(
     source_dir = get_stack_source_dir(stack)
     project_dir = get_stack_project_dir(config.name)
 
-    console.print(f"Deploying stack '{config.name}'")
+    get_console().print(f"Deploying stack '{config.name}'")
 
     if isinstance(config.source, GitHubSource):
         _handle_github_source(config, project_dir, surek_config, pull)
@@ -83,8 +84,6 @@ def deploy_system_stack(surek_config: SurekConfig) -> None:
     Args:
         surek_config: The main Surek configuration.
     """
-    from surek.core.config import load_stack_config
-
     system_dir = get_system_dir()
     system_config_path = system_dir / "surek.stack.yml"
     system_config = load_stack_config(system_config_path)
@@ -110,7 +109,7 @@ def deploy_system_stack(surek_config: SurekConfig) -> None:
 
     project_dir = get_stack_project_dir(system_config.name)
 
-    console.print("Deploying system containers")
+    get_console().print("Deploying system containers")
 
     if project_dir.exists():
         shutil.rmtree(project_dir)
@@ -145,7 +144,7 @@ def start_stack(config: StackConfig, pull: bool = False) -> None:
     if not patched_path.exists():
         raise SurekError(f"Couldn't find compose file for stack '{config.name}'. Deploy it first.")
 
-    console.print("Starting containers...")
+    get_console().print("Starting containers...")
     args = ["-d", "--build"]
     if pull:
         args.extend(["--pull", "always"])
@@ -177,7 +176,7 @@ def stop_stack(config: StackConfig, silent: bool = False) -> None:
         raise SurekError(f"Couldn't find compose file for stack '{config.name}'")
 
     if not silent:
-        console.print("Stopping containers...")
+        get_console().print("Stopping containers...")
 
     run_docker_compose(
         compose_file=patched_path,
@@ -1,26 +1,32 @@
 """Docker client wrapper and utilities."""
 
+import re
 import subprocess
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-import docker
-from docker.errors import DockerException
+from typing import TYPE_CHECKING, Any
 
 from surek.exceptions import DockerError
-from surek.utils.logging import console, print_dim
+from surek.utils.logging import get_console, print_dim, run_command
+
+if TYPE_CHECKING:
+    import docker
 
 # Docker network and labels
 SUREK_NETWORK = "surek"
 DEFAULT_LABELS = {"surek.managed": "true"}
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+COMPOSE_SERVICE_LABEL = "com.docker.compose.service"
+
+# Health suffix of a container status line, e.g. "Up 5 minutes (healthy)"
+_HEALTH_RE = re.compile(r"\((healthy|unhealthy|health: starting)\)")
 
 # Singleton Docker client
-_docker_client: docker.DockerClient | None = None
+_docker_client: "docker.DockerClient | None" = None
 
 
-def get_docker_client() -> docker.DockerClient:
+def get_docker_client() -> "docker.DockerClient":
     """Get or create the Docker client singleton.
 
     Returns:
@@ -32,6 +38,10 @@ def get_docker_client() -> docker.DockerClient:
     global _docker_client
 
     if _docker_client is None:
+        # The SDK pulls in requests/urllib3, so only import it once it's needed
+        import docker
+        from docker.errors import DockerException
+
         try:
             _docker_client = docker.from_env()
             _docker_client.ping()
@@ -52,7 +62,7 @@ def ensure_surek_network() -> None:
     existing = client.networks.list(names=[SUREK_NETWORK])
 
     if not existing:
-        console.print(f"Creating Docker network '{SUREK_NETWORK}'")
+        get_console().print(f"Creating Docker network '{SUREK_NETWORK}'")
         client.networks.create(
             name=SUREK_NETWORK,
             driver="bridge",
@@ -60,6 +70,68 @@ def ensure_surek_network() -> None:
         )
 
 
+def prune_docker_resources(volumes: bool = False) -> int:
+    """Remove unused containers, networks, images and build cache.
+
+    Equivalent to `docker system prune -f`, but talks to the daemon over the
+    SDK's connection instead of spawning the docker CLI.
+
+    Args:
+        volumes: If True, also remove unused anonymous volumes.
+
+    Returns:
+        Total reclaimed space in bytes.
+
+    Raises:
+        DockerError: If Docker can't be reached or a prune call fails.
+    """
+    from docker.errors import DockerException
+
+    client = get_docker_client()
+    # Removing stopped containers is what frees their networks, volumes and images,
+    # so it goes first. The remaining resource types don't depend on each other.
+    prune_calls = [client.api.prune_networks, client.api.prune_images, client.api.prune_builds]
+    if volumes:
+        prune_calls.append(client.api.prune_volumes)
+
+    try:
+        reclaimed = client.api.prune_containers().get("SpaceReclaimed") or 0
+        with ThreadPoolExecutor(max_workers=len(prune_calls)) as executor:
+            futures = [executor.submit(prune_call) for prune_call in prune_calls]
+            for future in as_completed(futures):
+                reclaimed += future.result().get("SpaceReclaimed") or 0
+    except DockerException as e:
+        raise DockerError(f"Failed to prune Docker resources: {e}") from e
+    return reclaimed
+
+
+def get_running_projects() -> set[str]:
+    """Get names of Docker Compose projects with running containers.
+
+    Uses a single `docker ps` call, so checking many stacks doesn't cost
+    a round-trip per stack and doesn't need the Docker SDK.
+
+    Returns:
+        Set of project names.
+
+    Raises:
+        DockerError: If Docker can't be queried.
+    """
+    cmd = [
+        "docker",
+        "ps",
+        "--filter",
+        "label=com.docker.compose.project",
+        "--format",
+        '{{.Label "com.docker.compose.project"}}',
+    ]
+    try:
+        result = run_command(cmd, capture_output=True, silent=True)
+    except OSError as e:
+        raise DockerError(f"Failed to list containers: {e}") from e
+    return {line for line in result.stdout.splitlines() if line}
+
+
 @dataclass
 class ServiceHealth:
     """Health information for a Docker container/service."""
@@ -83,113 +155,175 @@ class StackStatusDetailed:
     memory_bytes: int
 
 
-def _get_container_stats(container: Any) -> tuple[str, float, int]:
-    """Get stats for a single container.
+def _get_container_stats(
+    client: "docker.DockerClient", container_id: str
+) -> tuple[str, float, int]:
+    """Get stats for a single running container.
 
     Args:
-        container: Docker container object.
+        client: Docker client.
+        container_id: ID of the container.
 
     Returns:
         Tuple of (container_id, cpu_percent, memory_bytes).
     """
     try:
-        if container.status == "running":
-            stats: dict[str, Any] = container.stats(stream=False)  # type: ignore[assignment]
-            cpu_percent = _calculate_cpu_percent(stats)
-            memory_stats: dict[str, Any] = stats.get("memory_stats", {})
-            memory_bytes = (
-                int(memory_stats.get("usage", 0) or 0) if isinstance(memory_stats, dict) else 0
-            )
-            return (container.id, cpu_percent, memory_bytes)
+        stats: dict[str, Any] = client.api.stats(container_id, stream=False)
+        cpu_percent = _calculate_cpu_percent(stats)
+        memory_stats: dict[str, Any] = stats.get("memory_stats", {})
+        memory_bytes = (
+            int(memory_stats.get("usage", 0) or 0) if isinstance(memory_stats, dict) else 0
+        )
+        return (container_id, cpu_percent, memory_bytes)
     except Exception:
-        pass
-    return (container.id, 0.0, 0)
+        return (container_id, 0.0, 0)
 
 
-def get_stack_status_detailed(stack_name: str, include_stats: bool = False) -> StackStatusDetailed:
-    """Get detailed status for a stack including health and optionally resources.
+def _empty_status(status_text: str) -> StackStatusDetailed:
+    """Create a status for a stack without containers to report on."""
+    return StackStatusDetailed(
+        status_text=status_text,
+        services=[],
+        health_details=[],
+        health_summary="-",
+        cpu_percent=0,
+        memory_bytes=0,
+    )
+
+
+def _container_health(status: str) -> str | None:
+    """Extract the health state from a container's status line.
 
     Args:
-        stack_name: Name of the stack (Docker Compose project name).
+        status: Status as listed by Docker, e.g. "Up 5 minutes (healthy)".
+
+    Returns:
+        "healthy", "unhealthy", "starting", or None without a healthcheck.
+    """
+    match = _HEALTH_RE.search(status)
+    if not match:
+        return None
+    return match.group(1).removeprefix("health: ")
+
+
+def get_stacks_status_detailed(
+    stack_names: list[str], include_stats: bool = False
+) -> dict[str, StackStatusDetailed]:
+    """Get detailed status for several stacks at once.
+
+    Containers of all stacks are listed with a single Docker API call, and
+    stats for every running container are fetched in one parallel batch.
+
+    Args:
+        stack_names: Names of the stacks (Docker Compose project names).
         include_stats: If True, fetch CPU/memory stats (slower, ~1-2s per container).
-                      Stats are fetched in parallel when enabled.
 
     Returns:
-        Detailed status information.
+        Detailed status information keyed by stack name.
     """
-    from surek.utils.paths import get_stack_project_dir
-
-    project_dir = get_stack_project_dir(stack_name)
-    compose_file = project_dir / "docker-compose.surek.yml"
-
-    if not project_dir.exists() or not compose_file.exists():
-        return StackStatusDetailed(
-            status_text="× Not deployed",
-            services=[],
-            health_details=[],
-            health_summary="-",
-            cpu_percent=0,
-            memory_bytes=0,
-        )
+    from surek.utils.paths import get_projects_dir
+
+    statuses: dict[str, StackStatusDetailed] = {}
+    containers_by_stack: dict[str, list[dict[str, Any]]] = {}
+    # Resolved once, each lookup would otherwise ask for the working directory again
+    projects_dir = get_projects_dir()
+    for name in stack_names:
+        compose_file = projects_dir / name / "docker-compose.surek.yml"
+        if compose_file.exists():
+            containers_by_stack[name] = []
+        else:
+            statuses[name] = _empty_status("× Not deployed")
+
+    if not containers_by_stack:
+        return statuses
 
     try:
         client = get_docker_client()
     except DockerError:
-        return StackStatusDetailed(
-            status_text="? Docker unavailable",
-            services=[],
-            health_details=[],
-            health_summary="-",
-            cpu_percent=0,
-            memory_bytes=0,
-        )
-
-    # Get containers for this project
-    containers = client.containers.list(
-        all=True, filters={"label": f"com.docker.compose.project={stack_name}"}
-    )
-
-    if not containers:
-        return StackStatusDetailed(
-            status_text="× Down",
-            services=[],
-            health_details=[],
-            health_summary="-",
-            cpu_percent=0,
-            memory_bytes=0,
-        )
+        for name in containers_by_stack:
+            statuses[name] = _empty_status("? Docker unavailable")
+        return statuses
+
+    # A plain listing is one API call, unlike containers.list which inspects each container.
+    # Label filters are ANDed, so only a single stack can be narrowed down by the daemon.
+    label_filter = COMPOSE_PROJECT_LABEL
+    if len(containers_by_stack) == 1:
+        label_filter = f"{COMPOSE_PROJECT_LABEL}={next(iter(containers_by_stack))}"
+    for container in client.api.containers(all=True, filters={"label": label_filter}):
+        project = (container.get("Labels") or {}).get(COMPOSE_PROJECT_LABEL)
+        if project in containers_by_stack:
+            containers_by_stack[project].append(container)
 
     # Fetch stats in parallel if requested
     stats_by_id: dict[str, tuple[float, int]] = {}
     if include_stats:
-        running_containers = [c for c in containers if c.status == "running"]
-        if running_containers:
-            with ThreadPoolExecutor(max_workers=min(len(running_containers), 10)) as executor:
-                futures = {executor.submit(_get_container_stats, c): c for c in running_containers}
+        running_ids = [
+            container["Id"]
+            for containers in containers_by_stack.values()
+            for container in containers
+            if container.get("State") == "running"
+        ]
+        if running_ids:
+            with ThreadPoolExecutor(max_workers=min(len(running_ids), 10)) as executor:
+                futures = [
+                    executor.submit(_get_container_stats, client, container_id)
+                    for container_id in running_ids
+                ]
                 for future in as_completed(futures):
                     container_id, cpu, mem = future.result()
                     stats_by_id[container_id] = (cpu, mem)
 
+    for name, containers in containers_by_stack.items():
+        statuses[name] = _summarize_stack(containers, stats_by_id)
+    return statuses
+
+
+def get_stack_status_detailed(stack_name: str, include_stats: bool = False) -> StackStatusDetailed:
+    """Get detailed status for a stack including health and optionally resources.
+
+    Args:
+        stack_name: Name of the stack (Docker Compose project name).
+        include_stats: If True, fetch CPU/memory stats (slower, ~1-2s per container).
+                      Stats are fetched in parallel when enabled.
+
+    Returns:
+        Detailed status information.
+    """
+    return get_stacks_status_detailed([stack_name], include_stats)[stack_name]
+
+
+def _summarize_stack(
+    containers: list[dict[str, Any]], stats_by_id: dict[str, tuple[float, int]]
+) -> StackStatusDetailed:
+    """Build a stack status from its listed containers.
+
+    Args:
+        containers: Containers of the stack, as returned by the Docker list API.
+        stats_by_id: CPU percent and memory bytes keyed by container ID.
+
+    Returns:
+        Detailed status information.
+    """
+    if not containers:
+        return _empty_status("× Down")
+
     services: list[ServiceHealth] = []
     total_cpu = 0.0
     total_memory = 0
     health_details: list[str] = []
 
     for container in containers:
-        service_name = container.labels.get("com.docker.compose.service", container.name)
-
-        health: str | None = None
-        state = container.attrs.get("State", {})
-        if "Health" in state:
-            health = state["Health"].get("Status")
+        labels = container.get("Labels") or {}
+        names = container.get("Names") or [""]
+        service_name = labels.get(COMPOSE_SERVICE_LABEL, names[0].lstrip("/"))
 
-        container_id = container.id or ""
-        cpu_percent, memory_bytes = stats_by_id.get(container_id, (0.0, 0))
+        health = _container_health(container.get("Status", ""))
+        cpu_percent, memory_bytes = stats_by_id.get(container["Id"], (0.0, 0))
 
         services.append(
             ServiceHealth(
                 name=service_name,
-                status=container.status,
+                status=container.get("State", ""),
                 health=health,
                 cpu_percent=cpu_percent,
                 memory_bytes=memory_bytes,
@@ -13,7 +13,7 @@ import httpx
 from surek.exceptions import GitHubError
 from surek.models.config import SurekConfig
 from surek.models.stack import GitHubSource
-from surek.utils.logging import console, print_dim
+from surek.utils.logging import get_console, print_dim
 from surek.utils.paths import get_data_dir
 
 
@@ -132,7 +132,7 @@ def pull_github_repo(
     if not config.github:
         raise GitHubError("GitHub PAT is required for this")
 
-    console.print(f"Downloading GitHub repo {source.slug}")
+    get_console().print(f"Downloading GitHub repo {source.slug}")
 
     headers = {
         "Authorization": f"token {config.github.pat}",
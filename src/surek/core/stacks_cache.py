@@ -0,0 +1,104 @@
+"""Persistent cache of stack names for shell completion.
+
+Completion runs on every Tab press, so it must not import pydantic or parse
+every stack config. Names are cached per config file, keyed by its mtime and
+size, and only changed files are loaded again. Configs that fail to load aren't
+cached, as they may only be broken until a variable they use is set.
+
+Completion must not leave anything behind, so the cache is only written when
+surek-data/ already exists.
+"""
+
+import contextlib
+import json
+from pathlib import Path
+from typing import Any
+
+from surek.exceptions import SurekError
+from surek.utils.paths import get_stacks_dir
+
+
+def get_cache_file() -> Path:
+    """Get the path to the stacks cache file, without creating surek-data/.
+
+    Returns:
+        Path to surek-data/stacks_cache.json
+    """
+    return Path.cwd() / "surek-data" / "stacks_cache.json"
+
+
+def get_cached_stack_names() -> list[str]:
+    """Get the names of all valid stacks in the stacks/ directory.
+
+    Returns:
+        Sorted list of stack names.
+
+    Raises:
+        SurekError: If the stacks directory doesn't exist.
+    """
+    stacks_dir = get_stacks_dir()
+    if not stacks_dir.exists():
+        raise SurekError("Folder 'stacks' not found in current working directory")
+
+    cache = _read_cache()
+    entries: dict[str, dict[str, Any]] = {}
+    for config_path in stacks_dir.glob("*/surek.stack.yml"):
+        try:
+            stat = config_path.stat()
+        except OSError:
+            continue
+        key = str(config_path)
+        entry = cache.get(key)
+        if (
+            not isinstance(entry, dict)
+            or not entry.get("name")
+            or entry.get("mtime_ns") != stat.st_mtime_ns
+            or entry.get("size") != stat.st_size
+        ):
+            name = _load_stack_name(config_path)
+            if name is None:
+                continue
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "name": name}
+        entries[key] = entry
+
+    if entries != cache:
+        _write_cache(entries)
+
+    return sorted(entry["name"] for entry in entries.values())
+
+
+def _load_stack_name(config_path: Path) -> str | None:
+    """Load a stack config and return its name, or None if it isn't usable.
+
+    Args:
+        config_path: Path to the surek.stack.yml file.
+
+    Returns:
+        Stack name, or None for invalid configs and reserved names.
+    """
+    from surek.core.config import load_stack_config
+    from surek.core.stacks import RESERVED_STACK_NAMES
+
+    try:
+        name = load_stack_config(config_path).name
+    except Exception:
+        return None
+    return None if name.lower() in RESERVED_STACK_NAMES else name
+
+
+def _read_cache() -> dict[str, Any]:
+    """Read the cache file, treating a missing or broken file as empty."""
+    try:
+        cache = json.loads(get_cache_file().read_text())
+    except (json.JSONDecodeError, OSError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_cache(entries: dict[str, dict[str, Any]]) -> None:
+    """Write the cache file, ignoring failures as the cache is optional."""
+    cache_file = get_cache_file()
+    if not cache_file.parent.is_dir():
+        return
+    with contextlib.suppress(OSError):
+        cache_file.write_text(json.dumps(entries, indent=2))
@@ -9,7 +9,7 @@ from textual.widgets import DataTable
 
 from surek.core.config import load_config, load_stack_config
 from surek.core.deploy import deploy_stack, deploy_system_stack, start_stack, stop_stack
-from surek.core.docker import ensure_surek_network, get_stack_status_detailed
+from surek.core.docker import ensure_surek_network, get_stacks_status_detailed
 from surek.core.stacks import SYSTEM_STACK_NAME, get_available_stacks, get_stack_by_name
 from surek.exceptions import SurekError
 from surek.tui.screens.stack_info import StackInfoScreen
@@ -70,51 +70,49 @@ class StacksPane(Container):
         table.clear()
 
         try:
-            system_status = get_stack_status_detailed(SYSTEM_STACK_NAME)
-            table.add_row(
-                _centered("System"),
-                _centered(system_status.status_text),
-                _centered(system_status.health_summary),
-                _centered(""),
-                key=SYSTEM_STACK_NAME,
-                height=ROW_HEIGHT,
-            )
-        except Exception:
-            table.add_row(
-                _centered("System"),
-                _centered("? Unknown"),
-                _centered("-"),
-                _centered(""),
-                key=SYSTEM_STACK_NAME,
-                height=ROW_HEIGHT,
-            )
+            stacks = get_available_stacks()
+        except SurekError:
+            stacks = []  # No stacks directory
 
+        # One container listing covers all stacks
+        names = [SYSTEM_STACK_NAME] + [s.config.name for s in stacks if s.valid and s.config]
         try:
-            stacks = get_available_stacks()
-            for stack in stacks:
-                if not stack.valid:
-                    table.add_row(
-                        _centered(str(stack.path.parent.name)),
-                        _centered("Invalid config"),
-                        _centered("-"),
-                        _centered(str(stack.path.parent.name)),
-                        key=f"invalid-{stack.path}",
-                        height=ROW_HEIGHT,
-                    )
-                    continue
+            statuses = get_stacks_status_detailed(names)
+        except Exception:
+            statuses = {}
+
+        system_status = statuses.get(SYSTEM_STACK_NAME)
+        table.add_row(
+            _centered("System"),
+            _centered(system_status.status_text if system_status else "? Unknown"),
+            _centered(system_status.health_summary if system_status else "-"),
+            _centered(""),
+            key=SYSTEM_STACK_NAME,
+            height=ROW_HEIGHT,
+        )
 
-                if stack.config:
-                    status = get_stack_status_detailed(stack.config.name)
-                    table.add_row(
-                        _centered(stack.config.name),
-                        _centered(status.status_text),
-                        _centered(status.health_summary),
-                        _centered(str(stack.path.parent.name)),
-                        key=stack.config.name,
-                        height=ROW_HEIGHT,
-                    )
-        except SurekError:
-            pass  # No stacks directory
+        for stack in stacks:
+            if not stack.valid:
+                table.add_row(
+                    _centered(str(stack.path.parent.name)),
+                    _centered("Invalid config"),
+                    _centered("-"),
+                    _centered(str(stack.path.parent.name)),
+                    key=f"invalid-{stack.path}",
+                    height=ROW_HEIGHT,
+                )
+                continue
+
+            if stack.config:
+                status = statuses.get(stack.config.name)
+                table.add_row(
+                    _centered(stack.config.name),
+                    _centered(status.status_text if status else "? Unknown"),
+                    _centered(status.health_summary if status else "-"),
+                    _centered(str(stack.path.parent.name)),
+                    key=stack.config.name,
+                    height=ROW_HEIGHT,
+                )
 
     def _get_selected_stack(self) -> str | None:
         table: DataTable[str] = self.query_one("#stacks-table", DataTable)
@@ -1,13 +1,14 @@
 """Utility modules for Surek."""
 
-from surek.utils.env import expand_env_vars, expand_env_vars_in_dict
-from surek.utils.logging import console
+from surek.utils.env import expand_env_vars, expand_env_vars_in_dict, read_env_file
+from surek.utils.logging import get_console
 from surek.utils.paths import get_data_dir, get_system_dir
 
 __all__ = [
-    "console",
     "expand_env_vars",
     "expand_env_vars_in_dict",
+    "get_console",
     "get_data_dir",
     "get_system_dir",
+    "read_env_file",
 ]
@@ -2,6 +2,7 @@
 
 import os
 import re
+from pathlib import Path
 from typing import Any
 
 
@@ -44,6 +45,34 @@ def expand_env_vars(value: str) -> str:
     return re.sub(pattern, replacer, value)
 
 
+def read_env_file(path: Path) -> dict[str, str]:
+    """Read KEY=value assignments from an env file.
+
+    Blank lines and comments are skipped, and quotes around values are removed.
+    Values are taken literally, without variable expansion.
+
+    Args:
+        path: Path to the env file.
+
+    Returns:
+        Variables defined in the file.
+
+    Raises:
+        OSError: If the file can't be read.
+    """
+    env: dict[str, str] = {}
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.partition("=")
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        env[key.strip()] = value
+    return env
+
+
 def expand_env_vars_in_dict(data: dict[str, Any]) -> dict[str, Any]:
     """Recursively expand environment variables in a dictionary.
 
@@ -1,38 +1,59 @@
 """Logging utilities for Surek."""
 
+import json
 import subprocess
+import sys
+from functools import cache
 
 from rich.console import Console
 
 from surek.exceptions import SurekError
 
-# Shared console instance for consistent output
-console = Console()
+BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
+@cache
+def get_console() -> Console:
+    """Return the shared console, creating it on first use.
+
+    Creating a Console probes the terminal, so it is deferred until
+    something is actually printed.
+    """
+    return Console()
 
 
 def print_error(message: str) -> None:
     """Print an error message."""
-    console.print(f"[red]Error:[/red] {message}")
+    get_console().print(f"[red]Error:[/red] {message}")
 
 
 def print_warning(message: str) -> None:
     """Print a warning message."""
-    console.print(f"[yellow]Warning:[/yellow] {message}")
+    get_console().print(f"[yellow]Warning:[/yellow] {message}")
 
 
 def print_success(message: str) -> None:
     """Print a success message."""
-    console.print(f"[green]{message}[/green]")
+    get_console().print(f"[green]{message}[/green]")
 
 
 def print_info(message: str) -> None:
     """Print an info message."""
-    console.print(message)
+    get_console().print(message)
 
 
 def print_dim(message: str) -> None:
     """Print a dimmed/muted message."""
-    console.print(f"[dim]{message}[/dim]")
+    get_console().print(f"[dim]{message}[/dim]")
+
+
+def print_json(data: object) -> None:
+    """Print data as indented JSON.
+
+    Written straight to stdout, so rich neither parses markup in the values
+    nor wraps long lines, either of which would break the output.
+    """
+    sys.stdout.write(json.dumps(data, indent=2) + "\n")
 
 
 def run_command(
@@ -78,8 +99,6 @@ def format_bytes(num_bytes: int) -> str:
     Returns:
         Human-readable string (e.g., "1.5 GB").
     """
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if abs(num_bytes) < 1024.0:
-            return f"{num_bytes:.1f} {unit}"
-        num_bytes = int(num_bytes / 1024.0)
-    return f"{num_bytes:.1f} PB"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    exponent = min(max(abs(num_bytes).bit_length() - 1, 0) // 10, len(BYTE_UNITS) - 1)
+    return f"{num_bytes / (1 << (10 * exponent)):.1f} {BYTE_UNITS[exponent]}"
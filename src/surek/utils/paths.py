@@ -1,18 +1,28 @@
 """Path utilities and constants for Surek."""
 
+from functools import cache
 from importlib import resources
 from pathlib import Path
 
 
+@cache
+def _ensure_dir(path: Path) -> Path:
+    """Create a directory once per process.
+
+    Path helpers are called for every stack, so repeating mkdir each time
+    would cost a syscall per level per call.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def get_data_dir() -> Path:
     """Get the Surek data directory, creating it if necessary.
 
     Returns:
         Path to surek-data/ in the current working directory.
     """
-    data_dir = Path.cwd() / "surek-data"
-    data_dir.mkdir(parents=True, exist_ok=True)
-    return data_dir
+    return _ensure_dir(Path.cwd() / "surek-data")
 
 
 def get_projects_dir() -> Path:
@@ -21,9 +31,7 @@ def get_projects_dir() -> Path:
     Returns:
         Path to surek-data/projects/
     """
-    projects_dir = get_data_dir() / "projects"
-    projects_dir.mkdir(parents=True, exist_ok=True)
-    return projects_dir
+    return _ensure_dir(get_data_dir() / "projects")
 
 
 def get_volumes_dir() -> Path:
@@ -32,9 +40,7 @@ def get_volumes_dir() -> Path:
     Returns:
         Path to surek-data/volumes/
     """
-    volumes_dir = get_data_dir() / "volumes"
-    volumes_dir.mkdir(parents=True, exist_ok=True)
-    return volumes_dir
+    return _ensure_dir(get_data_dir() / "volumes")
 
 
 def get_stacks_dir() -> Path:
@@ -46,6 +52,7 @@ def get_stacks_dir() -> Path:
     return Path.cwd() / "stacks"
 
 
+@cache
 def get_system_dir() -> Path:
     """Get the system directory containing system container definitions.
 
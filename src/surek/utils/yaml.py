@@ -0,0 +1,10 @@
+"""YAML loader and dumper classes shared by config and compose handling."""
+
+# libyaml's parser and emitter are several times faster; PyYAML wheels usually ship it
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # type: ignore[assignment]
+
+__all__ = ["SafeDumper", "SafeLoader"]